@@ -0,0 +1,78 @@
+'''
+Cost of the mosaik data exchange of BasicSimulator for 10k DataCenter entities with all 5 attributes requested:
+get_data and input handling as they were before the precompiled output plans (per-attribute list scan and
+getattr, per-entity input lookup) versus the current implementation. Also checks that both return the same data.
+
+Run from the repository root: python benchmarks/basic_simulator_access_benchmark.py
+'''
+import sys
+import time
+
+sys.path.append('.')
+
+from simulators.data_center_sim import DataCenterSim
+
+NUM_ENTITIES = 10_000
+NUM_CALLS    = 20
+
+PARAMS = dict(max_computing_power=50.0e3, max_cooling_power=50.0e3, cooling_threshold=10.0, max_temperature=40.0)
+
+def legacy_get_data(simulator, outputs):
+    data = {'time': simulator.time}
+
+    for eid, attributes in outputs.items():
+        entity = simulator.entities[eid]
+        data[eid] = {}
+
+        for attribute in attributes:
+            if attribute not in simulator.meta["models"][simulator.model]["attrs"]:
+                raise ValueError(f"Unknown output attribute {attribute}")
+
+            attribute_value = getattr(entity, attribute)
+            if attribute_value is not None:
+                data[eid][attribute] = attribute_value
+
+    return data
+
+def legacy_set_inputs(simulator, inputs):
+    for eid, entity in simulator.entities.items():
+        if eid in inputs:
+            for attr, value in inputs[eid].items():
+                setattr(entity, attr, list(value.values())[0])
+
+def time_calls(function, *args):
+    function(*args) # the first call compiles the output plan
+    start = time.perf_counter()
+    for _ in range(NUM_CALLS):
+        result = function(*args)
+    return (time.perf_counter() - start) / NUM_CALLS, result
+
+def main():
+    simulator = DataCenterSim()
+    simulator.init("DataCenterSim-0", step_size=900)
+    eids = [entity["eid"] for entity in simulator.create(NUM_ENTITIES, "DataCenter", **PARAMS)]
+
+    attributes = simulator.meta["models"]["DataCenter"]["attrs"]
+    outputs = {eid: list(attributes) for eid in eids}
+    inputs = {
+        eid: {"outdoor_temperature": {"TemperatureSim-0.Temperature_0": 20.0 + index % 7},
+              "pv_input"           : {"PvSystemSim-0.PvSystem_0": -1.0e3 * (index % 5)}}
+        for index, eid in enumerate(eids)
+    }
+    simulator.step(0, inputs, None)
+
+    legacy_output_time, legacy_data = time_calls(legacy_get_data, simulator, outputs)
+    output_time, data = time_calls(simulator.get_data, outputs)
+    legacy_input_time, _ = time_calls(legacy_set_inputs, simulator, inputs)
+    input_time, _ = time_calls(simulator.apply_inputs, inputs)
+
+    if data != legacy_data:
+        raise RuntimeError("get_data returned different data than the legacy implementation")
+
+    print(f"{NUM_ENTITIES} entities x {len(attributes)} attributes")
+    print(f"{'':>10} {'before [ms]':>12} {'after [ms]':>11} {'speedup':>8}")
+    for name, before, after in (("get_data", legacy_output_time, output_time), ("inputs", legacy_input_time, input_time)):
+        print(f"{name:>10} {before * 1e3:12.2f} {after * 1e3:11.2f} {before / after:7.1f}x")
+
+if __name__ == "__main__":
+    main()
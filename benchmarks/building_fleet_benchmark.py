@@ -0,0 +1,87 @@
+'''
+Per-step cost of BuildingSim (one Building dataclass per entity) vs. BuildingBatchSim (BuildingFleet,
+one vectorized pass) and a check that both produce identical temperatures.
+
+Run from the repository root: python benchmarks/building_fleet_benchmark.py
+'''
+import sys
+import time
+
+import numpy as np
+
+sys.path.append('.')
+
+from simulators.building_sim import BuildingSim, BuildingBatchSim
+
+FLEET_SIZES = [100, 1_000, 10_000, 100_000]
+NUM_STEPS   = 20
+STEP_SIZE   = 600 # [s]
+
+BUILDING_PARAMS = dict(
+    thermal_capacity_building= 50.0e3,
+    heat_loss_coefficient    =  1.8e3,
+    setpoint_temperature     = 20.0,
+    thermal_capacity_tank    =  3.5e3,
+    tank_to_building_transfer=  8.0e3
+)
+
+def make_inputs(entities, step):
+    rng = np.random.default_rng(step)
+    outdoor_temperatures = rng.normal(5, 5, len(entities))
+    heat_inputs = rng.uniform(0, 40e3, len(entities))
+
+    return {
+        entity['eid']: {
+            'outdoor_temperature': {'Temperature-0.Temperature_0': outdoor_temperature},
+            'heat_input'         : {'HeatPumpSim-0.HeatPump_0'   : heat_input},
+        }
+        for entity, outdoor_temperature, heat_input in zip(entities, outdoor_temperatures, heat_inputs)
+    }
+
+def run(simulator_class, num_buildings):
+    simulator = simulator_class()
+    simulator.init('BuildingSim-0', step_size=STEP_SIZE)
+    entities = simulator.create(num_buildings, 'Building', **BUILDING_PARAMS)
+    all_inputs = [make_inputs(entities, step) for step in range(NUM_STEPS)]
+    outputs = {entity['eid']: ['building_temperature', 'tank_temperature'] for entity in entities}
+
+    start = time.perf_counter()
+    for step, inputs in enumerate(all_inputs):
+        simulator.step(step * STEP_SIZE, inputs, max_advance=None)
+        data = simulator.get_data(outputs)
+    elapsed = (time.perf_counter() - start) / NUM_STEPS
+
+    return elapsed, data
+
+def time_fleet_step_only(num_buildings):
+    simulator = BuildingBatchSim()
+    simulator.init('BuildingSim-0', step_size=STEP_SIZE)
+    simulator.create(num_buildings, 'Building', **BUILDING_PARAMS)
+
+    start = time.perf_counter()
+    for _ in range(NUM_STEPS):
+        simulator.fleet.step(STEP_SIZE / 3600)
+    return (time.perf_counter() - start) / NUM_STEPS
+
+def main():
+    print("Per step, including input scattering and get_data for all buildings:")
+    print(f"{'buildings':>10} {'scalar [ms/step]':>17} {'batch [ms/step]':>16} {'fleet.step [ms]':>16} {'max deviation':>14}")
+
+    for num_buildings in FLEET_SIZES:
+        scalar_time, scalar_data = run(BuildingSim, num_buildings)
+        batch_time, batch_data = run(BuildingBatchSim, num_buildings)
+
+        deviation = max(
+            abs(scalar_data[eid][attribute] - batch_data[eid][attribute])
+            for eid in scalar_data if eid != 'time' for attribute in scalar_data[eid]
+        )
+
+        fleet_step_time = time_fleet_step_only(num_buildings)
+
+        print(
+            f"{num_buildings:>10} {scalar_time * 1e3:>17.2f} {batch_time * 1e3:>16.2f} "
+            f"{fleet_step_time * 1e3:>16.3f} {deviation:>14.1e}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+'''
+Accuracy of the explicit Euler and the exact exponential Building integrator for increasing step sizes.
+
+The building is driven by hourly piecewise-constant inputs (outdoor temperature, heat pump on/off), so every
+step size below divides the input period and only the integration error differs. The reference solution is
+explicit Euler with 1-second steps.
+
+Run from the repository root: python benchmarks/building_integrator_benchmark.py
+'''
+import sys
+import math
+import time
+import datetime as dt
+
+sys.path.append('.')
+
+from models.building import Building
+
+STEP_SIZES      = [60, 300, 600, 1800, 3600] # [s]
+REFERENCE_STEP  = 1                          # [s]
+INPUT_PERIOD    = 3600                       # [s]
+DURATION        = 2 * 24 * 3600              # [s]
+
+BUILDING_PARAMS = dict(
+    thermal_capacity_building= 50.0e3,
+    heat_loss_coefficient    =  1.8e3,
+    setpoint_temperature     = 20.0,
+    thermal_capacity_tank    =  3.5e3,
+    tank_to_building_transfer=  8.0e3
+)
+
+def inputs_at(seconds):
+    hour = seconds // INPUT_PERIOD
+    outdoor_temperature = 5 + 5 * math.sin(2 * math.pi * hour / 24)
+    heat_input = 40e3 if hour % 4 < 2 else 0.0
+    return outdoor_temperature, heat_input
+
+def simulate(integrator, step_size):
+    building = Building(**BUILDING_PARAMS, integrator=integrator)
+    time_step = dt.timedelta(seconds=step_size)
+    trajectory = {}
+
+    for seconds in range(0, DURATION, step_size):
+        if seconds % INPUT_PERIOD == 0:
+            trajectory[seconds] = (building.building_temperature, building.tank_temperature)
+        building.outdoor_temperature, building.heat_input = inputs_at(seconds)
+        building.step(time_step)
+
+    return trajectory
+
+def max_error(trajectory, reference):
+    return max(
+        max(abs(value - reference_value) for value, reference_value in zip(trajectory[seconds], reference[seconds]))
+        for seconds in trajectory
+    )
+
+def main():
+    reference = simulate("euler", REFERENCE_STEP)
+
+    print(f"Max. temperature error [K] against Euler with {REFERENCE_STEP} s steps, sampled hourly over {DURATION // 3600} h")
+    print(f"{'step [s]':>9} {'euler':>10} {'exponential':>12} {'euler [ms]':>11} {'exponential [ms]':>17}")
+
+    for step_size in STEP_SIZES:
+        results = {}
+        for integrator in ("euler", "exponential"):
+            start = time.perf_counter()
+            trajectory = simulate(integrator, step_size)
+            results[integrator] = (max_error(trajectory, reference), time.perf_counter() - start)
+
+        (euler_error, euler_time), (exponential_error, exponential_time) = results["euler"], results["exponential"]
+        print(
+            f"{step_size:>9} {euler_error:>10.4f} {exponential_error:>12.4f} "
+            f"{euler_time * 1e3:>11.1f} {exponential_time * 1e3:>17.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+'''
+Scaling of the channel data exchange of BasicMulticontrollerSimulator with the number of channels (heat exchanger
+ports): get_data for all channels with the channel registry versus the previous reverse lookup, which scanned all
+systems for every attribute of every channel. Uses a minimal controller and a stand-in for the mosaik proxy, so
+no network is solved.
+
+Run from the repository root: python benchmarks/channel_registry_benchmark.py
+'''
+import sys
+import time
+from dataclasses import dataclass
+
+sys.path.append('.')
+
+from simulators.basic_simulators.basic_multicontroller_simulator import BasicMulticontrollerSimulator
+
+CHANNEL_COUNTS  = [50, 500, 5_000]
+NUM_CALLS       = 5
+CHANNEL_OUTPUTS = ["supply_temperature", "massflow"]
+
+META = {
+    'type': 'hybrid',
+    'models': {
+        'Network': {'public': True, 'params': ["num_channels"], 'attrs': []},
+        'Port'   : {'public': True, 'params': [], 'attrs': ["heat_consumption", *CHANNEL_OUTPUTS]},
+    }
+}
+
+@dataclass
+class Port:
+    heat_consumption  : float = 0.0
+    supply_temperature: float = 25.0
+    massflow          : float = 1.0
+
+class Network:
+    def initialize_controlled_systems(self, consumers, positions):
+        self.controlled_systems = {consumer: Port() for consumer in consumers}
+
+class MosaikProxy:
+    '''Answers get_related_entities as if channel i were connected to HeatPump_i.'''
+    async def get_related_entities(self, entity_ids):
+        return {
+            entity_id: {f"HeatPumpSim-0.HeatPump_{index}": {"type": "HeatPump"}}
+            for index, entity_id in enumerate(entity_ids)
+        }
+
+class NetworkSim(BasicMulticontrollerSimulator):
+    def __init__(self):
+        super().__init__(META, Network)
+
+def legacy_get_channel_data(simulator, outputs):
+    '''Channel part of get_data before the registry: reverse lookup of the system per attribute.'''
+    systems_channels_dict = dict(simulator.channels.system_channels)
+    data = {'time': simulator.time}
+
+    for channel_id, attributes in outputs.items():
+        controller = simulator.controllers[simulator.channels.channel_controllers[channel_id]]
+        data[channel_id] = {}
+
+        for attribute in attributes:
+            system_id = next(key for key, value in systems_channels_dict.items() if value == channel_id)
+            data[channel_id][attribute] = getattr(controller.controlled_systems[system_id], attribute)
+
+    return data
+
+def time_calls(function, *args):
+    start = time.perf_counter()
+    for _ in range(NUM_CALLS):
+        result = function(*args)
+    return (time.perf_counter() - start) / NUM_CALLS, result
+
+def main():
+    print(f"{'channels':>9} {'setup [ms]':>11} {'registry [ms]':>14} {'reverse lookup [ms]':>20}")
+
+    for num_channels in CHANNEL_COUNTS:
+        simulator = NetworkSim()
+        simulator.mosaik = MosaikProxy()
+        simulator.init("NetworkSim-0", step_size=900)
+        controller = simulator.create(1, "Network", num_channels=num_channels)[0]
+
+        start = time.perf_counter()
+        simulator.setup_done()
+        setup_time = time.perf_counter() - start
+
+        outputs = {channel["eid"]: CHANNEL_OUTPUTS for channel in controller["children"]}
+        registry_time, data = time_calls(simulator.get_data, outputs)
+        legacy_time, legacy_data = time_calls(legacy_get_channel_data, simulator, outputs)
+
+        if data != legacy_data:
+            raise RuntimeError("The registry returned different data than the reverse lookup")
+
+        print(f"{num_channels:>9} {setup_time * 1e3:11.2f} {registry_time * 1e3:14.3f} {legacy_time * 1e3:20.1f}")
+
+if __name__ == "__main__":
+    main()
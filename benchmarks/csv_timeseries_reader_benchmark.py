@@ -0,0 +1,60 @@
+'''
+Per-call cost of CsvTimeseriesReader.get_value_at_or_before for growing CSV files.
+
+Run from the repository root: python benchmarks/csv_timeseries_reader_benchmark.py
+'''
+import os
+import sys
+import tempfile
+import timeit
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('.')
+
+from models.Auxiliary.csv_timeseries_reader import CsvTimeseriesReader
+
+ROW_COUNTS = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+NUM_CALLS  = 10_000
+START_TIME = dt.datetime(2023, 1, 1)
+
+def write_minute_csv(path, num_rows):
+    index = pd.date_range(START_TIME, periods=num_rows, freq="min", name="time")
+    pd.DataFrame({"value": np.random.rand(num_rows)}, index=index).to_csv(path)
+
+def forward_query_times(num_rows):
+    # Walk forward through the whole file in NUM_CALLS equal steps, like a simulation would
+    step = dt.timedelta(minutes=max(num_rows // NUM_CALLS, 1))
+    return [START_TIME + i * step for i in range(NUM_CALLS)]
+
+def random_query_times(num_rows):
+    offsets = np.random.randint(0, num_rows, NUM_CALLS)
+    return [START_TIME + dt.timedelta(minutes=int(offset)) for offset in offsets]
+
+def time_per_call(reader, query_times):
+    def run():
+        for query_time in query_times:
+            reader.get_value_at_or_before(query_time)
+
+    return min(timeit.repeat(run, number=1, repeat=3)) / len(query_times)
+
+def main():
+    print(f"{'rows':>12} {'forward [us/call]':>18} {'random [us/call]':>18}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for num_rows in ROW_COUNTS:
+            csv_path = os.path.join(directory, f"series_{num_rows}.csv")
+            write_minute_csv(csv_path, num_rows)
+            reader = CsvTimeseriesReader(csv_path)
+
+            forward = time_per_call(reader, forward_query_times(num_rows))
+            random  = time_per_call(reader, random_query_times(num_rows))
+
+            print(f"{num_rows:>12} {forward * 1e6:>18.2f} {random * 1e6:>18.2f}")
+
+            os.remove(csv_path)
+
+if __name__ == "__main__":
+    main()
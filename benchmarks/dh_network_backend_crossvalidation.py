@@ -0,0 +1,110 @@
+'''
+Cross-validation of the DHNetwork solver backends (see SOLVER_BACKENDS in models/dh_network.py) on the demo
+network and on synthetic networks (see dh_network_update_benchmark.py), for several demand patterns: all
+consumers idle, demands drifting slowly from step to step, and random demands that change sign.
+
+Deviations are the largest differences of the sparse backend's supply temperatures [degC], massflows [kg/s] and
+grid return temperature [degC] from the pandapipes backend, over all steps. The harness fails if one exceeds
+the tolerances below.
+
+The backends differ slightly in the node energy balance: the sparse backend mixes the inflows of a node
+weighted by their massflows, pandapipes weights them by massflow times a heat capacity that it evaluates at the
+mean heat capacity of the inflow and the node. This leaves temperature deviations in the order of 1e-3 K.
+
+Run from the repository root: python benchmarks/dh_network_backend_crossvalidation.py
+'''
+import sys
+import time
+import logging
+import tempfile
+import warnings
+
+import numpy as np
+
+sys.path.append('.')
+
+from models.dh_network import DHNetwork
+from benchmarks.dh_network_update_benchmark import make_network
+
+DEMO_NETWORK          = "data/anergy_demo_network.json"
+HEAT_EXCHANGER_COUNTS = [10, 100, 500]
+NUM_STEPS             = 10
+BACKENDS              = ("pandapipes", "sparse")
+
+TEMPERATURE_TOLERANCE = 1e-2 # [K]
+MASSFLOW_TOLERANCE    = 1e-6 # [kg/s]
+
+def make_demands(num_consumers, amplitude):
+    random = np.random.default_rng(0)
+    base = np.linspace(-amplitude, amplitude, num_consumers)
+
+    return {
+        "idle"   : np.zeros((NUM_STEPS, num_consumers)),
+        "drift"  : base * (1.0 + 0.01 * np.arange(NUM_STEPS)[:, np.newaxis]),
+        "random" : random.uniform(-amplitude, amplitude, (NUM_STEPS, num_consumers)),
+    }
+
+def run_steps(network, demands):
+    outputs = []
+
+    start = time.perf_counter()
+    for step, step_demands in enumerate(demands):
+        network.consumer_heat_consumption[:] = step_demands
+        network.step(step * 600)
+        outputs.append(np.concatenate([
+            network.consumer_supply_temperature, network.consumer_massflow, [network.grid_return_temperature]]))
+    elapsed = time.perf_counter() - start
+
+    return elapsed / len(demands), np.array(outputs)
+
+def compare(name, make, demands):
+    num_consumers = demands["idle"].shape[1]
+
+    for pattern, pattern_demands in demands.items():
+        results = {}
+        for backend in BACKENDS:
+            results[backend] = run_steps(make(solver_backend=backend), pattern_demands)
+
+        (reference_time, reference_outputs), (sparse_time, sparse_outputs) = (results[backend] for backend in BACKENDS)
+        deviation = np.abs(sparse_outputs - reference_outputs)
+        supply_deviation = deviation[:, :num_consumers].max()
+        massflow_deviation = deviation[:, num_consumers:-1].max()
+        return_deviation = deviation[:, -1].max()
+
+        print(
+            f"{name:>22} {pattern:>7} {supply_deviation:18.2e} {massflow_deviation:14.2e} {return_deviation:18.2e} "
+            f"{reference_time * 1e3:21.1f} {sparse_time * 1e3:17.1f}"
+        )
+
+        if max(supply_deviation, return_deviation) > TEMPERATURE_TOLERANCE or massflow_deviation > MASSFLOW_TOLERANCE:
+            raise RuntimeError(f"The solver backends disagree on the {name} network with {pattern} demands")
+
+def make_demo_network(**params):
+    network = DHNetwork(network_definition_path=DEMO_NETWORK, **params)
+    network.initialize_controlled_systems([f"HeatPumpSim-0.HeatPump_{index}" for index in range(3)])
+    return network
+
+def main():
+    warnings.simplefilter("ignore")
+    logging.getLogger("pandapipes").setLevel(logging.ERROR)
+
+    print(
+        f"{'network':>22} {'demands':>7} {'supply temp. dev.':>18} {'massflow dev.':>14} {'return temp. dev.':>18} "
+        f"{'pandapipes [ms/step]':>21} {'sparse [ms/step]':>17}"
+    )
+
+    # Compile the pandapipes kernels before timing
+    make_demo_network().step(0)
+
+    compare("demo", make_demo_network, make_demands(3, 50e3))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for num_heat_exchangers in HEAT_EXCHANGER_COUNTS:
+            compare(
+                f"{num_heat_exchangers} heat exchangers",
+                lambda **params: make_network(num_heat_exchangers, directory, **params),
+                make_demands(num_heat_exchangers, 5e3)
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+'''
+Cost of DHNetwork steps when hydraulics are only re-solved every few steps, with heat-only solves on the frozen
+hydraulic solution in between. One day of 10-minute steps on the demo network and on a synthetic network (see
+dh_network_update_benchmark.py), with demands following a daily profile and the grid massflow raised at noon.
+The set-point change forces a hydraulic solve in every setting (see HYDRAULIC_INPUT_COLUMNS in
+models/dh_network.py), so "once a day" only solves hydraulics at the start and at noon.
+
+Deviations are the largest differences of supply temperatures [degC] and massflows [kg/s] from solving
+hydraulics in every step.
+
+Run from the repository root: python benchmarks/dh_network_hydraulics_interval_benchmark.py
+'''
+import sys
+import time
+import logging
+import tempfile
+import warnings
+
+import numpy as np
+
+sys.path.append('.')
+
+from models.dh_network import DHNetwork
+from benchmarks.dh_network_update_benchmark import make_network
+
+DEMO_NETWORK        = "data/anergy_demo_network.json"
+NUM_HEAT_EXCHANGERS = 100
+NUM_STEPS           = 144 # one day of 10-minute steps
+SET_POINT_STEP      = NUM_STEPS // 2
+SET_POINT_SCALING   = 1.2 # grid massflow from noon on, relative to the network definition
+SETTINGS = [
+    ("every step"       , {}),
+    ("every 6 steps"    , {"hydraulics_interval": 6}),
+    ("every 36 steps"   , {"hydraulics_interval": 36}),
+    ("once a day"       , {"hydraulics_interval": NUM_STEPS}),
+]
+
+def make_demands(num_consumers, amplitude):
+    base = np.linspace(-amplitude, amplitude, num_consumers)
+    profile = 1.0 + 0.5 * np.sin(np.linspace(0, 2 * np.pi, NUM_STEPS))[:, np.newaxis]
+    return base * profile
+
+def run_day(make, demands, **params):
+    network = make()
+    for name, value in params.items():
+        setattr(network, name, value)
+
+    outputs = []
+    start = time.perf_counter()
+    for step, step_demands in enumerate(demands):
+        if step == SET_POINT_STEP:
+            network.network.sink["mdot_kg_per_s"] *= SET_POINT_SCALING
+        network.consumer_heat_consumption[:] = step_demands
+        network.step(step * 600)
+        outputs.append(np.concatenate([network.consumer_supply_temperature, network.consumer_massflow]))
+    elapsed = time.perf_counter() - start
+
+    return network, elapsed / len(demands), np.array(outputs)
+
+def compare(name, make, demands):
+    num_consumers = demands.shape[1]
+    reference_outputs = None
+
+    for setting, params in SETTINGS:
+        network, step_time, outputs = run_day(make, demands, **params)
+        if reference_outputs is None:
+            reference_outputs = outputs
+
+        deviation = np.abs(outputs - reference_outputs)
+        print(
+            f"{name:>22} {setting:>15} {network.hydraulic_solves:10d} {network.heat_only_solves:10d} "
+            f"{step_time * 1e3:10.1f} {deviation[:, :num_consumers].max():17.2e} {deviation[:, num_consumers:].max():14.2e}"
+        )
+
+def make_demo_network():
+    network = DHNetwork(network_definition_path=DEMO_NETWORK)
+    network.initialize_controlled_systems([f"HeatPumpSim-0.HeatPump_{index}" for index in range(3)])
+    return network
+
+def main():
+    warnings.simplefilter("ignore")
+    logging.getLogger("pandapipes").setLevel(logging.ERROR)
+
+    # Compile the pandapipes kernels of both solve modes before timing
+    run_day(make_demo_network, make_demands(3, 50e3)[:2], hydraulics_interval=2)
+
+    print(
+        f"{'network':>22} {'hydraulics':>15} {'hydraulic':>10} {'heat-only':>10} {'[ms/step]':>10} "
+        f"{'supply temp. dev.':>17} {'massflow dev.':>14}"
+    )
+
+    compare("demo", make_demo_network, make_demands(3, 50e3))
+
+    with tempfile.TemporaryDirectory() as directory:
+        compare(
+            f"{NUM_HEAT_EXCHANGERS} heat exchangers",
+            lambda: make_network(NUM_HEAT_EXCHANGERS, directory),
+            make_demands(NUM_HEAT_EXCHANGERS, 5e3)
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+'''
+Hit rate, stored entries, wall time and output deviation of the DHNetwork result cache for one day of 10-minute
+steps on the demo network, for several quantisation tolerances. The demands follow a night setback (constant
+demands with measurement noise) and a daytime profile (varying demands with measurement noise); the data center
+port is idle all day.
+
+Deviations are the largest differences of supply temperatures [degC], massflows [kg/s] and grid return
+temperature [degC] from the uncached run.
+
+Run from the repository root: python benchmarks/dh_network_result_cache_benchmark.py
+'''
+import sys
+import time
+import logging
+import warnings
+
+import numpy as np
+
+sys.path.append('.')
+
+from models.dh_network import DHNetwork
+
+DEMO_NETWORK = "data/anergy_demo_network.json"
+NUM_STEPS    = 144             # one day of 10-minute steps
+NIGHT_STEPS  = 42              # 00:00 to 07:00
+NOISE        = 5.0             # [W] standard deviation of the measurement noise
+CACHE_SIZE   = 256
+TOLERANCES   = [1.0, 10.0, 100.0] # [W]
+
+def make_demands():
+    random = np.random.default_rng(0)
+
+    base = np.array([-20e3, 25e3, 30e3]) # [W] data center, two heat pumps
+    profile = np.ones((NUM_STEPS, 1))
+    profile[NIGHT_STEPS:] += 0.3 * np.sin(np.linspace(0, np.pi, NUM_STEPS - NIGHT_STEPS))[:, np.newaxis]
+
+    demands = base * profile + random.normal(0.0, NOISE, (NUM_STEPS, len(base)))
+    demands[:, 0] = base[0] # idle data center
+
+    return demands
+
+def run_day(demands, **cache_params):
+    network = DHNetwork(network_definition_path=DEMO_NETWORK, **cache_params)
+    network.initialize_controlled_systems([f"HeatPumpSim-0.HeatPump_{index}" for index in range(demands.shape[1])])
+
+    outputs = []
+    start = time.perf_counter()
+    for step, step_demands in enumerate(demands):
+        network.consumer_heat_consumption[:] = step_demands
+        network.step(step * 600)
+        outputs.append(np.concatenate([
+            network.consumer_supply_temperature, network.consumer_massflow, [network.grid_return_temperature]]))
+    elapsed = time.perf_counter() - start
+
+    return network, elapsed / len(demands), np.array(outputs)
+
+def main():
+    warnings.simplefilter("ignore")
+    logging.getLogger("pandapipes").setLevel(logging.ERROR)
+
+    demands = make_demands()
+    num_consumers = demands.shape[1]
+
+    # Compile the pandapipes kernels before timing
+    run_day(demands[:1])
+
+    _, uncached_time, uncached_outputs = run_day(demands)
+
+    print(
+        f"{'tolerance [W]':>13} {'hit rate':>9} {'entries':>8} {'[ms/step]':>10} "
+        f"{'supply temp. dev.':>18} {'massflow dev.':>14} {'return temp. dev.':>18}"
+    )
+    print(f"{'no cache':>13} {'':>9} {'':>8} {uncached_time * 1e3:10.1f}")
+
+    for tolerance in TOLERANCES:
+        network, cached_time, cached_outputs = run_day(
+            demands, result_cache_size=CACHE_SIZE, result_cache_tolerance=tolerance)
+
+        deviation = np.abs(cached_outputs - uncached_outputs)
+        print(
+            f"{tolerance:13.0f} {network.cache_hit_rate:9.2f} {network.cache_entries:8d} {cached_time * 1e3:10.1f} "
+            f"{deviation[:, :num_consumers].max():18.2e} {deviation[:, num_consumers:-1].max():14.2e} "
+            f"{deviation[:, -1].max():18.2e}"
+        )
+
+if __name__ == "__main__":
+    main()
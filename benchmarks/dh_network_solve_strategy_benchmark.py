@@ -0,0 +1,93 @@
+'''
+Pipeflow solves and wall time per DHNetwork step for the solve strategies (see SOLVE_STRATEGIES in
+models/dh_network.py), on the demo network and on synthetic networks (see dh_network_update_benchmark.py), none of
+which has pandapipes controllers:
+
+- single: one pipeflow per step.
+- control_then_pipeflow: the control loop (which runs a pipeflow) followed by a separate pipeflow, as before.
+
+Solves are counted by wrapping pandapipes.pipeflow. The outputs of both strategies must be identical.
+
+Run from the repository root: python benchmarks/dh_network_solve_strategy_benchmark.py
+'''
+import sys
+import time
+import logging
+import tempfile
+import warnings
+from unittest import mock
+
+import numpy as np
+import pandapipes
+
+sys.path.append('.')
+
+from models.dh_network import DHNetwork
+from benchmarks.dh_network_update_benchmark import make_network
+
+DEMO_NETWORK          = "data/anergy_demo_network.json"
+HEAT_EXCHANGER_COUNTS = [10, 100]
+NUM_STEPS             = 10
+STRATEGIES            = ("control_then_pipeflow", "single")
+
+def run_steps(network, demands):
+    outputs = []
+
+    with mock.patch.object(pandapipes, "pipeflow", wraps=pandapipes.pipeflow) as pipeflow:
+        start = time.perf_counter()
+        for step, step_demands in enumerate(demands):
+            network.consumer_heat_consumption[:] = step_demands
+            network.step(step * 600)
+            outputs.append(np.concatenate([network.consumer_supply_temperature, network.consumer_massflow]))
+        elapsed = time.perf_counter() - start
+
+    return pipeflow.call_count / len(demands), elapsed / len(demands), np.array(outputs)
+
+def make_demands(num_consumers, amplitude):
+    base = np.linspace(-amplitude, amplitude, num_consumers)
+    drift = 1.0 + 0.01 * np.arange(NUM_STEPS)[:, np.newaxis]
+    return base * drift
+
+def compare(name, make, demands):
+    results = {}
+    for strategy in STRATEGIES:
+        network = make()
+        network.solve_strategy = strategy
+        results[strategy] = run_steps(network, demands)
+
+    (old_solves, old_time, old_outputs), (new_solves, new_time, new_outputs) = (results[strategy] for strategy in STRATEGIES)
+
+    if not np.array_equal(old_outputs, new_outputs):
+        raise RuntimeError(f"The solve strategies produced different outputs on the {name} network")
+
+    print(f"{name:>22} {old_solves:21.1f} {new_solves:21.1f} {old_time * 1e3:17.1f} {new_time * 1e3:17.1f}")
+
+def make_demo_network():
+    network = DHNetwork(network_definition_path=DEMO_NETWORK)
+    network.initialize_controlled_systems([f"HeatPumpSim-0.HeatPump_{index}" for index in range(3)])
+    return network
+
+def main():
+    warnings.simplefilter("ignore")
+    logging.getLogger("pandapipes").setLevel(logging.ERROR)
+
+    print(
+        f"{'network':>22} {'before [solves/step]':>21} {'single [solves/step]':>21} "
+        f"{'before [ms/step]':>17} {'single [ms/step]':>17}"
+    )
+
+    # Compile the pandapipes kernels before timing
+    make_demo_network().step(0)
+
+    compare("demo", make_demo_network, make_demands(3, 50e3))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for num_heat_exchangers in HEAT_EXCHANGER_COUNTS:
+            compare(
+                f"{num_heat_exchangers} heat exchangers",
+                lambda: make_network(num_heat_exchangers, directory),
+                make_demands(num_heat_exchangers, 5e3)
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+'''
+Per-step cost of exchanging consumer data with the pandapipes tables of DHNetwork, for synthetic networks with
+10 to 5,000 heat exchangers (a supply and a return line with one substation per junction pair):
+
+- demand update: writing the heat consumption of all consumers into qext_w, vectorized versus one boolean-mask
+  .loc write per consumer as before.
+- result extraction: reading supply temperature and massflow of all consumers from the result tables, indexed
+  gathers versus name lookups per consumer as before.
+
+Only the data exchange is timed: the pipeflow is not run, the result tables are filled with synthetic values.
+
+Run from the repository root: python benchmarks/dh_network_update_benchmark.py
+'''
+import os
+import sys
+import json
+import time
+import tempfile
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('.')
+
+from models.dh_network import DHNetwork, kelvin_to_celsius
+
+HEAT_EXCHANGER_COUNTS = [10, 100, 1_000, 5_000]
+NUM_CALLS             = 3
+
+def make_network_definition(num_heat_exchangers):
+    junctions, pipes, heat_exchangers = [["n0s", [0, 0]], ["n0r", [0, -50]]], [], []
+
+    for index in range(1, num_heat_exchangers + 1):
+        junctions += [[f"n{index}s", [index * 10, 0]], [f"n{index}r", [index * 10, -50]]]
+        pipes += [
+            [f"l{index}s", f"n{index - 1}s", f"n{index}s", 0.05, 1],
+            [f"l{index}r", f"n{index}r", f"n{index - 1}r", 0.05, 1],
+        ]
+        heat_exchangers.append([f"hex{index}", f"n{index}s", f"n{index}r", 0])
+
+    return {
+        "external_grid": {"ambient_temperature": 8, "supply_temperature": 21, "pressure": 6,
+                          "junction": "n0s", "sink_node": "n0r"},
+        "junctions": junctions,
+        "pipes": pipes,
+        "valves": [],
+        "heat_exchangers": heat_exchangers,
+    }
+
+def make_network(num_heat_exchangers, directory, **params):
+    path = os.path.join(directory, f"network_{num_heat_exchangers}.json")
+    with open(path, "w") as file:
+        json.dump(make_network_definition(num_heat_exchangers), file)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        network = DHNetwork(network_definition_path=path, **params)
+
+    network.initialize_controlled_systems([f"HeatPumpSim-0.HeatPump_{index}" for index in range(num_heat_exchangers)])
+    network.consumer_heat_consumption[:] = np.linspace(-50e3, 50e3, num_heat_exchangers)
+
+    net = network.network
+    net.res_junction = pd.DataFrame({"t_k": np.linspace(290.0, 300.0, len(net.junction))}, index=net.junction.index)
+    net.res_heat_exchanger = pd.DataFrame(
+        {"mdot_from_kg_per_s": np.linspace(0.1, 5.0, len(net.heat_exchanger))}, index=net.heat_exchanger.index)
+    network._hydraulics_solved = True # the massflows are read only after a hydraulic solve
+
+    return network
+
+def legacy_update_consumer_heat_consumption(network):
+    for consumer_name, consumer in network.controlled_systems.items():
+        hex_name = network.consumer_to_hex[consumer_name]
+
+        network.network.heat_exchanger.loc[
+            network.network.heat_exchanger['name'] == hex_name,
+            "qext_w"
+        ] = consumer.heat_consumption
+
+def legacy_update_heat_exchanger_temperature_and_massflow(network):
+    for consumer_name, consumer in network.controlled_systems.items():
+        hex_name = network.consumer_to_hex[consumer_name]
+        from_junction = next(hex_data[1] for hex_data in network._network_data["heat_exchangers"] if hex_data[0] == hex_name)
+
+        junctions = network.network.junction['name'].tolist()
+        consumer.supply_temperature = kelvin_to_celsius(
+            network.network.res_junction.at[junctions.index(from_junction), 't_k'])
+
+        hex_names = network.network.heat_exchanger['name'].tolist()
+        consumer.massflow = network.network.res_heat_exchanger.at[hex_names.index(hex_name), 'mdot_from_kg_per_s']
+
+def time_calls(function, *args):
+    start = time.perf_counter()
+    for _ in range(NUM_CALLS):
+        function(*args)
+    return (time.perf_counter() - start) / NUM_CALLS
+
+def main():
+    print(
+        f"{'heat exchangers':>15} {'demand update [ms]':>19} {'before [ms]':>12} "
+        f"{'result extraction [ms]':>23} {'before [ms]':>12}"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        for num_heat_exchangers in HEAT_EXCHANGER_COUNTS:
+            network = make_network(num_heat_exchangers, directory)
+
+            update_time = time_calls(network._update_consumer_heat_consumption)
+            expected_qext = network.network.heat_exchanger["qext_w"].to_numpy().copy()
+            legacy_update_time = time_calls(legacy_update_consumer_heat_consumption, network)
+
+            if not np.array_equal(network.network.heat_exchanger["qext_w"].to_numpy(), expected_qext):
+                raise RuntimeError("The vectorized demand update wrote different values than the per-consumer update")
+
+            extraction_time = time_calls(network._update_heat_exchanger_temperature_and_massflow)
+            outputs = (network.consumer_supply_temperature.copy(), network.consumer_massflow.copy())
+            legacy_extraction_time = time_calls(legacy_update_heat_exchanger_temperature_and_massflow, network)
+
+            if not all(np.array_equal(new, old) for new, old in zip(outputs, (network.consumer_supply_temperature, network.consumer_massflow))):
+                raise RuntimeError("The indexed result extraction read different values than the name lookups")
+
+            print(
+                f"{num_heat_exchangers:>15} {update_time * 1e3:19.3f} {legacy_update_time * 1e3:12.1f} "
+                f"{extraction_time * 1e3:23.3f} {legacy_extraction_time * 1e3:12.1f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+'''
+Newton iterations and wall time of DHNetwork steps with cold-started and warm-started pandapipes solves, on the
+demo network and on synthetic networks (see dh_network_update_benchmark.py). The consumer demands drift slowly
+from step to step, as between consecutive steps of a scenario.
+
+Iterations per step are taken per solver stage from DHNetwork.solver_iterations, with count_solver_iterations
+(separate pipeflows for hydraulics and heat transfer) in both runs. The last column is the largest deviation of
+the warm-started outputs from the cold-started ones.
+
+Run from the repository root: python benchmarks/dh_network_warm_start_benchmark.py
+'''
+import sys
+import time
+import logging
+import tempfile
+import warnings
+
+import numpy as np
+
+sys.path.append('.')
+
+from models.dh_network import DHNetwork
+from benchmarks.dh_network_update_benchmark import make_network
+
+DEMO_NETWORK          = "data/anergy_demo_network.json"
+HEAT_EXCHANGER_COUNTS = [10, 100]
+NUM_STEPS             = 10
+STAGES                = ("hydraulics", "heat")
+
+def run_steps(network, demands):
+    iterations, outputs = [], []
+
+    start = time.perf_counter()
+    for step, step_demands in enumerate(demands):
+        network.consumer_heat_consumption[:] = step_demands
+        network.step(step * 600)
+        iterations.append([network.solver_iterations.get(stage, 0) for stage in STAGES])
+        outputs.append(np.concatenate([network.consumer_supply_temperature, network.consumer_massflow]))
+    elapsed = time.perf_counter() - start
+
+    # The first step has no previous results and is a cold start either way
+    return np.diff(iterations, axis=0).mean(axis=0), elapsed / len(demands), np.array(outputs)
+
+def make_demands(num_consumers, amplitude):
+    base = np.linspace(-amplitude, amplitude, num_consumers)
+    drift = 1.0 + 0.01 * np.arange(NUM_STEPS)[:, np.newaxis]
+    return base * drift
+
+def compare(name, make, demands):
+    results = {}
+    for warm_start in (False, True):
+        network = make()
+        network.warm_start = warm_start
+        network.count_solver_iterations = True
+        results[warm_start] = run_steps(network, demands)
+
+    (cold_iterations, cold_time, cold_outputs), (warm_iterations, warm_time, warm_outputs) = results[False], results[True]
+    deviation = np.max(np.abs(warm_outputs - cold_outputs))
+
+    print(
+        f"{name:>22} {cold_iterations[0]:16.1f} {warm_iterations[0]:16.1f} {cold_iterations[1]:15.1f} "
+        f"{warm_iterations[1]:15.1f} {cold_time * 1e3:15.1f} {warm_time * 1e3:15.1f} {deviation:14.2e}"
+    )
+
+def make_demo_network():
+    network = DHNetwork(network_definition_path=DEMO_NETWORK)
+    network.initialize_controlled_systems([f"HeatPumpSim-0.HeatPump_{index}" for index in range(3)])
+    return network
+
+def main():
+    warnings.simplefilter("ignore")
+    logging.getLogger("pandapipes").setLevel(logging.ERROR)
+
+    print(
+        f"{'':>22} {'hydraulics [iter/step]':>33} {'heat [iter/step]':>31}\n"
+        f"{'network':>22} {'cold':>16} {'warm':>16} {'cold':>15} {'warm':>15} "
+        f"{'cold [ms/step]':>15} {'warm [ms/step]':>15} {'max deviation':>14}"
+    )
+
+    # Compile the pandapipes kernels before timing
+    make_demo_network().step(0)
+
+    compare("demo", make_demo_network, make_demands(3, 50e3))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for num_heat_exchangers in HEAT_EXCHANGER_COUNTS:
+            compare(
+                f"{num_heat_exchangers} heat exchangers",
+                lambda: make_network(num_heat_exchangers, directory),
+                make_demands(num_heat_exchangers, 5e3)
+            )
+
+if __name__ == "__main__":
+    main()
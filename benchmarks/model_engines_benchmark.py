@@ -0,0 +1,115 @@
+'''
+Model step cost of the Building, HeatPump and DataCenter implementations: pure-Python dataclasses, the
+NumPy-vectorized fleets and the numba-compiled fleet kernels, for 1, 100 and 10k entities. Also checks that
+all engines produce the same outputs.
+
+Run from the repository root: python benchmarks/model_engines_benchmark.py
+'''
+import sys
+import time
+import datetime as dt
+
+import numpy as np
+
+sys.path.append('.')
+
+from models.building import BuildingFleet
+from models.heat_pump import HeatPumpFleet
+from models.data_center import DataCenterFleet
+from models.Auxiliary.numba_support import NUMBA_AVAILABLE
+
+ENTITY_COUNTS = [1, 100, 10_000]
+NUM_STEPS     = 50
+STEP_SIZE     = 600 # [s]
+
+MODELS = {
+    "Building": dict(
+        fleet_class=BuildingFleet,
+        params=dict(thermal_capacity_building=50.0e3, heat_loss_coefficient=1.8e3, setpoint_temperature=20.0,
+                    thermal_capacity_tank=3.5e3, tank_to_building_transfer=8.0e3),
+        inputs=dict(outdoor_temperature=(-10, 15), heat_input=(0, 40e3)),
+        outputs=["building_temperature", "tank_temperature"],
+        step_args=(STEP_SIZE / 3600,),
+    ),
+    "HeatPump": dict(
+        fleet_class=HeatPumpFleet,
+        params=dict(cop_nominal=4.0, heat_capacity_nominal=40.0e3, temp_min=50.0, temp_max=60.0),
+        inputs=dict(tank_temperature=(40, 70), supply_temperature=(15, 25), massflow=(0, 3)),
+        outputs=["heat_output", "heat_consumption", "electricity_consumption"],
+        step_args=(),
+    ),
+    "DataCenter": dict(
+        fleet_class=DataCenterFleet,
+        params=dict(max_computing_power=50.0e3, max_cooling_power=50.0e3, cooling_threshold=10.0, max_temperature=40.0),
+        inputs=dict(outdoor_temperature=(-10, 45), pv_input=(-200e3, 0)),
+        outputs=["electricity_consumption", "total_heat_output", "excess_heat"],
+        step_args=(),
+    ),
+}
+
+def random_inputs(spec, num_entities):
+    rng = np.random.default_rng(0)
+    return {name: rng.uniform(low, high, num_entities) for name, (low, high) in spec["inputs"].items()}
+
+def run_python(spec, num_entities, inputs):
+    entities = [spec["fleet_class"].model_class(**spec["params"]) for _ in range(num_entities)]
+    step_args = (dt.timedelta(seconds=STEP_SIZE),) if spec["step_args"] else ()
+
+    for name, values in inputs.items():
+        for entity, value in zip(entities, values.tolist()):
+            setattr(entity, name, value)
+
+    start = time.perf_counter()
+    for _ in range(NUM_STEPS):
+        for entity in entities:
+            entity.step(*step_args)
+    elapsed = (time.perf_counter() - start) / NUM_STEPS
+
+    return elapsed, {name: np.array([getattr(entity, name) for entity in entities]) for name in spec["outputs"]}
+
+def make_fleet(spec, num_entities, inputs):
+    fleet = spec["fleet_class"]()
+    fleet.add(num_entities, **spec["params"])
+    for name, values in inputs.items():
+        getattr(fleet, name)[:] = values
+    return fleet
+
+def run_fleet(spec, num_entities, inputs, step_method):
+    warm_up_fleet = make_fleet(spec, 1, {name: values[:1] for name, values in inputs.items()})
+    getattr(warm_up_fleet, step_method)(*spec["step_args"]) # loads or compiles the numba kernel
+
+    fleet = make_fleet(spec, num_entities, inputs)
+    step = getattr(fleet, step_method)
+
+    start = time.perf_counter()
+    for _ in range(NUM_STEPS):
+        step(*spec["step_args"])
+    elapsed = (time.perf_counter() - start) / NUM_STEPS
+
+    return elapsed, {name: np.array(getattr(fleet, name)) for name in spec["outputs"]}
+
+def main():
+    if not NUMBA_AVAILABLE:
+        print("numba is not installed: the 'numba' column shows the uncompiled kernels.")
+
+    print(f"{'model':>10} {'entities':>9} {'python [us]':>12} {'numpy [us]':>11} {'numba [us]':>11} {'max deviation':>14}")
+
+    engines = {"numpy": "step", "numba": "step_compiled"}
+
+    for model_name, spec in MODELS.items():
+        for num_entities in ENTITY_COUNTS:
+            inputs = random_inputs(spec, num_entities)
+            python_time, reference = run_python(spec, num_entities, inputs)
+
+            times, deviation = {}, 0.0
+            for engine, step_method in engines.items():
+                times[engine], outputs = run_fleet(spec, num_entities, inputs, step_method)
+                deviation = max(deviation, max(np.max(np.abs(outputs[name] - reference[name])) for name in reference))
+
+            print(
+                f"{model_name:>10} {num_entities:>9} {python_time * 1e6:12.1f} {times['numpy'] * 1e6:11.1f} "
+                f"{times['numba'] * 1e6:11.1f} {deviation:14.1e}"
+            )
+
+if __name__ == "__main__":
+    main()
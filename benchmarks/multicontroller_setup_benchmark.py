@@ -0,0 +1,61 @@
+'''
+setup_done time of BasicMulticontrollerSimulator for 1, 10 and 100 controllers (50 channels each): related
+entities resolved through the shared background event loop versus a new thread pool and event loop per call,
+as before. Uses the minimal network and mosaik proxy stand-ins of channel_registry_benchmark.py.
+
+Run from the repository root: python benchmarks/multicontroller_setup_benchmark.py
+'''
+import sys
+import time
+import asyncio
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append('.')
+
+from benchmarks.channel_registry_benchmark import NetworkSim, MosaikProxy
+from simulators.basic_simulators import basic_multicontroller_simulator
+
+CONTROLLER_COUNTS       = [1, 10, 100]
+CHANNELS_PER_CONTROLLER = 50
+NUM_REPETITIONS         = 20
+
+def legacy_run_async_in_thread(coroutine):
+    with ThreadPoolExecutor() as executor:
+        loop = asyncio.new_event_loop()
+        future = executor.submit(loop.run_until_complete, coroutine)
+        result = future.result()
+        loop.close()
+        return result
+
+def time_setup(num_controllers):
+    total_time = 0.0
+    for _ in range(NUM_REPETITIONS):
+        simulator = NetworkSim()
+        simulator.mosaik = MosaikProxy()
+        simulator.init("NetworkSim-0", step_size=900)
+        simulator.create(num_controllers, "Network", num_channels=CHANNELS_PER_CONTROLLER)
+
+        start = time.perf_counter()
+        simulator.setup_done()
+        total_time += time.perf_counter() - start
+
+    return total_time / NUM_REPETITIONS
+
+def main():
+    time_setup(1) # starts the background loop
+
+    print(f"{'controllers':>11} {'channels':>9} {'shared loop [ms]':>17} {'loop per call [ms]':>19}")
+
+    for num_controllers in CONTROLLER_COUNTS:
+        setup_time = time_setup(num_controllers)
+        with mock.patch.object(basic_multicontroller_simulator, "run_async_in_thread", legacy_run_async_in_thread):
+            legacy_setup_time = time_setup(num_controllers)
+
+        print(
+            f"{num_controllers:>11} {num_controllers * CHANNELS_PER_CONTROLLER:>9} "
+            f"{setup_time * 1e3:17.2f} {legacy_setup_time * 1e3:19.2f}"
+        )
+
+if __name__ == "__main__":
+    main()
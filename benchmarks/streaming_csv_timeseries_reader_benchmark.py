@@ -0,0 +1,72 @@
+'''
+Memory and time of stepping through a synthetic 10-year, 1-minute, multi-station weather file
+with the in-memory CsvTimeseriesReader and the StreamingCsvTimeseriesReader.
+
+Run from the repository root: python benchmarks/streaming_csv_timeseries_reader_benchmark.py
+'''
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('.')
+
+from models.Auxiliary.csv_timeseries_reader import CsvTimeseriesReader
+from models.Auxiliary.streaming_csv_timeseries_reader import StreamingCsvTimeseriesReader
+from models.Auxiliary.timeseries_cache import TimeseriesCache
+
+NUM_YEARS    = 10
+NUM_STATIONS = 4
+STEP_SIZE    = dt.timedelta(minutes=10)
+START_TIME   = dt.datetime(2015, 1, 1)
+
+def write_weather_csv(path):
+    index = pd.date_range(START_TIME, START_TIME + dt.timedelta(days=365 * NUM_YEARS), freq="min", name="time")
+    stations = {f"station_{i}": np.random.normal(10, 8, len(index)).round(2) for i in range(NUM_STATIONS)}
+    pd.DataFrame(stations, index=index).to_csv(path)
+    return len(index)
+
+def step_through(reader, num_rows):
+    num_steps = int(num_rows * dt.timedelta(minutes=1) / STEP_SIZE)
+    for step in range(num_steps):
+        reader.get_value_at_or_before(START_TIME + step * STEP_SIZE)
+    return num_steps
+
+def measure(create_reader, num_rows):
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    reader = create_reader()
+    num_steps = step_through(reader, num_rows)
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if hasattr(reader, "close"):
+        reader.close()
+
+    return elapsed, peak, num_steps
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "weather.csv")
+        num_rows = write_weather_csv(csv_path)
+        print(f"{num_rows} rows x {NUM_STATIONS} stations, {os.path.getsize(csv_path) / 2**20:.0f} MiB on disk")
+
+        readers = {
+            "in-memory": lambda: CsvTimeseriesReader(csv_path, cache=TimeseriesCache(), use_sidecar=False),
+            "streaming": lambda: StreamingCsvTimeseriesReader(csv_path),
+        }
+
+        for name, create_reader in readers.items():
+            elapsed, peak, num_steps = measure(create_reader, num_rows)
+            print(f"{name:>10}: {elapsed:6.1f} s for {num_steps} steps, peak memory {peak / 2**20:7.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,215 @@
 import datetime as dt
+import warnings
+import weakref
+from functools import partial
+import numpy as np
 import pandas as pd
 
+from models.Auxiliary.timeseries_cache import SHARED_TIMESERIES_CACHE, Timeseries, TimeseriesCache
+from models.Auxiliary.timeseries_sidecar import load_sidecar, write_sidecar
+
+MAX_CURSOR_ADVANCE = 8 # rows scanned linearly before falling back to a binary search
+
+NANOSECONDS_PER_SECOND = 1_000_000_000
+
+RESAMPLING_METHODS = (
+    "hold",   # value at or before each grid time
+    "linear", # linear interpolation between the surrounding rows
+    "mean",   # time-weighted average of the held values over [t, t + step_size)
+)
+
+class StepGridTimeseries:
+    '''
+    Timeseries resampled onto the simulation step grid 0, step_size, 2*step_size, ... [s since start].
+    '''
+    def __init__(self, values: np.ndarray, step_size: int):
+        self.step_size = step_size
+        self._values = values.tolist()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get_value(self, seconds_since_start: int):
+        '''Return the value for the given step, or None if the time is not on the grid.'''
+        index, remainder = divmod(seconds_since_start, self.step_size)
+
+        if remainder or not 0 <= index < len(self._values):
+            return None
+        return self._values[index]
+
 class CsvTimeseriesReader:
-    def __init__(self, csv_path: str):
-        self._data = self._read_data(csv_path)
+    '''
+    Step-wise lookup of a timeseries stored in a CSV file (first column: time, further columns: values).
+
+    By default the first value column is read. `columns` selects several value columns by name, e.g. one
+    per weather station of a wide table; get_row_at_or_before then returns all of them in one lookup.
+
+    Simulation time usually moves forward by a few rows per step, so the reader keeps a cursor on the
+    last returned row and only falls back to a binary search for jumps or backward queries.
+
+    The parsed data is shared read-only with all other readers of the same file through `cache`. With
+    `use_sidecar`, the parsed data is also stored in a binary sidecar next to the CSV file on first load and
+    memory-mapped from there on subsequent runs.
+    '''
+    def __init__(self, csv_path: str, columns: list = None, cache: TimeseriesCache = SHARED_TIMESERIES_CACHE,
+                 use_sidecar: bool = True):
+        cache_key, timeseries = cache.acquire(csv_path, partial(self._read_data, use_sidecar=use_sidecar))
+        weakref.finalize(self, cache.release, cache_key)
+
+        self._timestamps = timeseries.timestamps
+        self._values     = self._select_columns(timeseries.values, csv_path, columns)
+        self._cursor     = 0
+
+    @staticmethod
+    def _select_columns(values, csv_path, columns):
+        '''Rows x selected columns, or a 1-D view of the first value column if `columns` is None.'''
+        if columns is None:
+            return values[:, 0]
+
+        value_columns = pd.read_csv(csv_path, nrows=0).columns[1:].tolist()
+
+        unknown_columns = [column for column in columns if column not in value_columns]
+        if unknown_columns:
+            raise ValueError(f"Unknown columns {unknown_columns} in {csv_path}")
+
+        indices = [value_columns.index(column) for column in columns]
+        if indices == list(range(indices[0], indices[0] + len(indices))):
+            return values[:, indices[0]:indices[0] + len(indices)] # contiguous selection: view, no copy
+
+        return values[:, indices]
+
+    @classmethod
+    def _read_data(cls, csv_path, use_sidecar=True) -> Timeseries:
+        if not use_sidecar:
+            return cls.parse_csv(csv_path)
+
+        timeseries = load_sidecar(csv_path)
+        if timeseries is None:
+            timeseries = cls.parse_csv(csv_path)
+            cls._try_write_sidecar(csv_path, timeseries)
+
+        return timeseries
+
+    @staticmethod
+    def _try_write_sidecar(csv_path, timeseries):
+        try:
+            write_sidecar(csv_path, timeseries)
+        except OSError as error:
+            warnings.warn(f"Could not write timeseries sidecar for {csv_path}: {error}", UserWarning, stacklevel=2)
+
+    @classmethod
+    def parse_csv(cls, csv_path) -> Timeseries:
+        data = pd.read_csv(csv_path, index_col=0, parse_dates=True).sort_index(kind="stable")
+
+        return Timeseries(
+            timestamps=cls._to_int64_timestamps(data.index),
+            values    =data.to_numpy(dtype=np.float64, copy=True)
+        )
+
+    @staticmethod
+    def _to_int64_timestamps(index: pd.DatetimeIndex) -> np.ndarray:
+        return np.ascontiguousarray(index.values.astype("datetime64[ns]").view(np.int64))
 
-    def _read_data(self, csv_path):
-        return pd.read_csv(csv_path, index_col=0, parse_dates=True).iloc[:, 0]
-    
     def get_value_at_or_before(self, time: dt.datetime) -> float:
-        valid_times = self._data.index[self._data.index <= time]
+        position = self._find_position_at_or_before(pd.Timestamp(time).value)
 
-        if valid_times.empty:
+        if position < 0:
             raise ValueError("Invalid time")
         else:
-            closest_time = valid_times[-1]
-            return self._data.loc[closest_time]
\ No newline at end of file
+            return float(self._values[position])
+
+    def get_row_at_or_before(self, time: dt.datetime) -> np.ndarray:
+        '''Values of all selected columns at or before `time`.'''
+        position = self._find_position_at_or_before(pd.Timestamp(time).value)
+
+        if position < 0:
+            raise ValueError("Invalid time")
+        else:
+            return self._values[position]
+
+    def resample_to_step_grid(self, start_time: dt.datetime, step_size: int, duration: int, method: str = "hold"):
+        '''
+        Resample the series in one vectorized pass onto the steps of a simulation starting at
+        `start_time` and running for `duration` seconds with steps of `step_size` seconds.
+        '''
+        if method not in RESAMPLING_METHODS:
+            raise ValueError(f"Unknown resampling method {method}. Choose one of {RESAMPLING_METHODS}.")
+        if step_size is None or duration is None:
+            raise ValueError(
+                f"Resampling needs the step size and the duration of the simulation, but step_size={step_size} and "
+                f"duration={duration} were given."
+            )
+        if step_size <= 0:
+            raise ValueError(f"Step size must be positive, but {step_size} was given.")
+        if duration < 0:
+            raise ValueError(f"Duration must not be negative, but {duration} was given.")
+
+        num_steps = duration // step_size + 1
+        step_size_ns = step_size * NANOSECONDS_PER_SECOND
+        grid = pd.Timestamp(start_time).value + np.arange(num_steps, dtype=np.int64) * step_size_ns
+
+        if len(self._timestamps) == 0 or grid[0] < self._timestamps[0]:
+            raise ValueError("Invalid time")
+
+        if method == "hold":
+            values = self._values[self._positions_at_or_before(grid)]
+        elif method == "linear":
+            values = self._interpolate_linear(grid)
+        else:
+            values = self._average_over_steps(grid, step_size_ns)
+
+        return StepGridTimeseries(np.asarray(values, dtype=np.float64), step_size)
+
+    def _positions_at_or_before(self, timestamps: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self._timestamps, timestamps, side="right") - 1
+
+    def _interpolate_linear(self, grid):
+        # Relative times keep the nanosecond resolution when converting to float
+        origin = self._timestamps[0]
+        grid_times = (grid - origin).astype(np.float64)
+        row_times = (self._timestamps - origin).astype(np.float64)
+
+        if self._values.ndim == 1:
+            return np.interp(grid_times, row_times, self._values)
+        return np.column_stack([np.interp(grid_times, row_times, column) for column in self._values.T])
+
+    def _average_over_steps(self, grid, step_size_ns):
+        integral_at_step_start = self._integrate_held_values_until(grid)
+        integral_at_step_end = self._integrate_held_values_until(grid + step_size_ns)
+
+        return (integral_at_step_end - integral_at_step_start) / (step_size_ns / NANOSECONDS_PER_SECOND)
+
+    def _integrate_held_values_until(self, timestamps):
+        '''Integral [value * s] of the held (piecewise constant) series from its first row to each timestamp.'''
+        row_durations = self._as_column(np.diff(self._timestamps) / NANOSECONDS_PER_SECOND)
+        integral_increments = np.cumsum(self._values[:-1] * row_durations, axis=0)
+        integral_at_rows = np.concatenate((np.zeros_like(self._values[:1]), integral_increments))
+
+        positions = self._positions_at_or_before(timestamps)
+        time_since_row = self._as_column((timestamps - self._timestamps[positions]) / NANOSECONDS_PER_SECOND)
+
+        return integral_at_rows[positions] + self._values[positions] * time_since_row
+
+    def _as_column(self, array):
+        '''Reshape a per-row array so that it broadcasts against the (possibly 2-D) values.'''
+        return array.reshape(array.shape + (1,) * (self._values.ndim - 1))
+
+    def _find_position_at_or_before(self, timestamp: int) -> int:
+        timestamps = self._timestamps
+        cursor = self._cursor
+
+        if len(timestamps) == 0:
+            return -1
+
+        if timestamps[cursor] <= timestamp:
+            last_position = len(timestamps) - 1
+            for _ in range(MAX_CURSOR_ADVANCE):
+                if cursor == last_position or timestamps[cursor + 1] > timestamp:
+                    self._cursor = cursor
+                    return cursor
+                cursor += 1
+
+        position = int(np.searchsorted(timestamps, timestamp, side="right")) - 1
+        self._cursor = max(position, 0)
+
+        return position
@@ -0,0 +1,42 @@
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+
+def empty_column(dtype=np.float64):
+    return np.empty(0, dtype=dtype)
+
+def column(dtype=np.float64):
+    '''Fleet field of the given dtype, e.g. `column(np.int8)` for flags or `column(np.float32)`.'''
+    return field(default_factory=lambda: empty_column(dtype))
+
+@dataclass
+class Fleet:
+    '''
+    Struct-of-arrays storage for many instances of a dataclass model. Subclasses declare one array field
+    (column, float64 unless declared with column(dtype)) per model attribute they need, with the same name
+    as in `model_class`.
+    '''
+    model_class = None
+
+    def __len__(self):
+        return len(getattr(self, fields(self)[0].name))
+
+    @property
+    def nbytes(self) -> int:
+        '''Memory of all columns.'''
+        return sum(getattr(self, column.name).nbytes for column in fields(self))
+
+    def add(self, num: int, **params) -> int:
+        '''Append `num` instances with identical parameters. Returns the index of the first new instance.'''
+        return self._append_rows(num, self.model_class(**params))
+
+    def _append_rows(self, num: int, template) -> int:
+        '''Append `num` rows holding the attribute values of the model instance `template`.'''
+        first_index = len(self)
+
+        for column in fields(self):
+            values = getattr(self, column.name)
+            new_values = np.full(num, getattr(template, column.name), dtype=values.dtype)
+            setattr(self, column.name, np.concatenate((values, new_values)))
+
+        return first_index
@@ -0,0 +1,15 @@
+'''
+Optional numba support. Kernels decorated with `njit` are compiled when numba is installed and run as
+plain Python functions otherwise.
+'''
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda function: function
@@ -0,0 +1,147 @@
+import os
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import RegularGridInterpolator
+
+PERFORMANCE_MAP_AXES   = ("source_temperature", "sink_temperature", "part_load") # part_load is optional
+PERFORMANCE_MAP_VALUES = ("cop", "heat_capacity")
+
+MAX_TABLE_POINTS = 1 << 20 # of the precompiled lookup table, over all axes
+
+class PerformanceMap:
+    '''
+    Heat pump performance map (COP and heating capacity over source temperature, sink temperature and
+    optionally part load) precompiled into a lookup table on a uniform grid.
+
+    Because the grid is uniform, the cell of a query point follows from one subtraction and division per axis,
+    and evaluate() interpolates whole arrays of query points at once (bilinear for two axes, trilinear for
+    three). Queries outside the map are clamped to its boundary.
+
+    Maps whose uniform table would exceed MAX_TABLE_POINTS keep their original grid (`uniform=False`), and the
+    cell of a query point is found by a binary search per axis instead.
+    '''
+    def __init__(self, axes: dict, tables: dict, uniform: bool = True):
+        self.axis_names = list(axes)
+        self._origins = np.array([axis[0] for axis in axes.values()])
+        self._steps   = np.array([axis[1] - axis[0] if len(axis) > 1 else 1.0 for axis in axes.values()])
+        self._sizes   = np.array([len(axis) for axis in axes.values()])
+        self._tables  = tables
+        self._grid_axes = None if uniform else [np.asarray(axis, dtype=np.float64) for axis in axes.values()]
+
+    @classmethod
+    def from_csv(cls, csv_path: str):
+        '''
+        Read a map in long format, one row per operating point with the columns
+        source_temperature [°C], sink_temperature [°C], part_load [-] (optional), cop [-] and heat_capacity [W].
+        The points must form a full (not necessarily evenly spaced) grid.
+        '''
+        data = pd.read_csv(csv_path)
+        axis_names = [name for name in PERFORMANCE_MAP_AXES if name in data.columns]
+
+        missing_columns = [name for name in (*PERFORMANCE_MAP_AXES[:2], *PERFORMANCE_MAP_VALUES) if name not in data.columns]
+        if missing_columns:
+            raise ValueError(f"Performance map {csv_path} lacks the columns {missing_columns}")
+
+        grid = data.set_index(axis_names).sort_index()
+        source_axes = [np.array(level, dtype=np.float64) for level in grid.index.levels]
+        if len(grid) != np.prod([len(axis) for axis in source_axes]) or grid.index.has_duplicates:
+            raise ValueError(f"The operating points of performance map {csv_path} do not form a full grid")
+
+        source_shape = [len(axis) for axis in source_axes]
+        source_values = {
+            name: grid[name].to_numpy(dtype=np.float64).reshape(source_shape) for name in PERFORMANCE_MAP_VALUES
+        }
+
+        # Each uniform axis contains the source points, so the other axes keep at least their source sizes
+        uniform_axes = [
+            cls._uniform_axis(axis, MAX_TABLE_POINTS // (np.prod(source_shape) // len(axis)))
+            for axis in source_axes
+        ]
+        if any(axis is None for axis in uniform_axes):
+            return cls(dict(zip(axis_names, source_axes)), source_values, uniform=False)
+        if np.prod([len(axis) for axis in uniform_axes]) > MAX_TABLE_POINTS:
+            return cls(dict(zip(axis_names, source_axes)), source_values, uniform=False)
+
+        query_points = np.stack(np.meshgrid(*uniform_axes, indexing="ij"), axis=-1)
+        tables = {
+            name: RegularGridInterpolator(source_axes, values)(query_points) for name, values in source_values.items()
+        }
+
+        return cls(dict(zip(axis_names, uniform_axes)), tables)
+
+    @staticmethod
+    def _uniform_axis(axis, max_points):
+        '''
+        Evenly spaced axis that contains all points of `axis` (the largest step dividing all of its spacings),
+        so that no map detail is lost, or None if there is no such step with at most `max_points` points.
+        '''
+        if len(axis) == 1:
+            return axis
+
+        span = axis[-1] - axis[0]
+        smallest_spacing = np.min(np.diff(axis))
+
+        for refinement in range(1, max_points):
+            step = smallest_spacing / refinement
+            num_points = int(round(span / step)) + 1
+            if num_points > max_points:
+                break
+
+            positions = (axis - axis[0]) / step
+            if np.allclose(positions, np.round(positions), atol=1e-6):
+                return np.linspace(axis[0], axis[-1], num_points)
+
+        return None
+
+    def evaluate(self, value_name: str, source_temperature, sink_temperature, part_load=1.0):
+        '''Interpolate `value_name` ("cop" or "heat_capacity") for scalars or arrays of operating points.'''
+        coordinates = (source_temperature, sink_temperature, part_load)[:len(self.axis_names)]
+        coordinates = np.broadcast_arrays(*[np.asarray(coordinate, dtype=np.float64) for coordinate in coordinates])
+
+        lower_indices, weights = [], []
+        for axis, coordinate in enumerate(coordinates):
+            if self._grid_axes is None:
+                position = np.clip((coordinate - self._origins[axis]) / self._steps[axis], 0, self._sizes[axis] - 1)
+            else:
+                position = self._grid_position(self._grid_axes[axis], coordinate)
+            lower_index = np.minimum(position.astype(np.intp), max(self._sizes[axis] - 2, 0))
+            lower_indices.append(lower_index)
+            weights.append(position - lower_index)
+
+        table = self._tables[value_name]
+        result = np.zeros(coordinates[0].shape)
+
+        for corner in product((0, 1), repeat=len(coordinates)):
+            corner_weight = np.ones(coordinates[0].shape)
+            corner_index = []
+            for axis, offset in enumerate(corner):
+                corner_weight = corner_weight * (weights[axis] if offset else 1 - weights[axis])
+                corner_index.append(np.minimum(lower_indices[axis] + offset, self._sizes[axis] - 1))
+            result += corner_weight * table[tuple(corner_index)]
+
+        return result
+
+    @staticmethod
+    def _grid_position(axis, coordinate):
+        '''Fractional index of `coordinate` on the non-uniform `axis`, clamped to the axis.'''
+        if len(axis) == 1:
+            return np.zeros(coordinate.shape)
+
+        lower_index = np.clip(np.searchsorted(axis, coordinate, side="right") - 1, 0, len(axis) - 2)
+        lower_points = axis[lower_index]
+        fraction = (coordinate - lower_points) / (axis[lower_index + 1] - lower_points)
+
+        return lower_index + np.clip(fraction, 0, 1)
+
+def load_performance_map(csv_path: str) -> PerformanceMap:
+    '''Return the compiled map of the file, building it only once per file version for all heat pumps.'''
+    absolute_path = os.path.abspath(csv_path)
+    file_stats = os.stat(absolute_path)
+    return _load_performance_map(absolute_path, file_stats.st_mtime_ns, file_stats.st_size)
+
+@lru_cache(maxsize=None)
+def _load_performance_map(absolute_path, mtime_ns, size):
+    return PerformanceMap.from_csv(absolute_path)
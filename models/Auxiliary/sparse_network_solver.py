@@ -0,0 +1,312 @@
+import numpy as np
+import scipy.sparse as sparse
+from scipy.sparse.linalg import splu, spsolve
+
+P_CONVERSION           = 1e5    # [Pa/bar]
+ZERO_CELSIUS_K         = 273.15 # [K]
+STAGNANT_TEMPERATURE_K = 293.15 # [K] temperature of nodes without flow (pandapipes' default ambient temperature)
+ZERO_FLOW              = 1e-10  # [kg/s] flows up to this magnitude count as no flow
+
+class SolverNotConverged(RuntimeError):
+    pass
+
+class SparseNetworkSolver:
+    '''
+    Steady-state hydraulic and thermal solver for the JSON network definitions of DHNetwork, following the
+    equations of pandapipes for incompressible fluids without its per-call table bookkeeping.
+
+    The network is held as arrays over nodes (junctions, then the internal nodes of pipes with several sections)
+    and branches (pipe sections, valves, heat exchangers):
+
+    - Hydraulics: Newton iterations on node pressures and branch massflows, with the pressure drop
+      (lambda * L / D + zeta) * m|m| / (2 A^2 rho) and the Nikuradse friction factor 64 / Re + lambda_turbulent.
+      The Jacobian keeps its sparsity pattern between iterations, so only its friction entries are updated and
+      every factorisation reuses the column ordering (COLAMD) of the first one.
+    - Heat transfer: on the resulting flows, the outlet temperature of each branch follows from the temperature
+      of its upstream node, the heat loss to the ambient and its heat extraction qext; each node mixes its
+      inflows. This is a sparse linear system in the node temperatures, re-solved until the heat capacities
+      (evaluated at the branch temperatures) settle.
+
+    Fluid properties come from a pandapipes fluid (get_density, get_viscosity and get_heat_capacity over
+    temperature). For the hydraulics they are evaluated at the initial junction temperature, as in a cold-started
+    sequential pandapipes solve.
+    '''
+    def __init__(self, network_data: dict, fluid, grid_massflow: float, pipe_diameter_m: float,
+                 pipe_roughness_mm: float, pipe_u_w_per_m2k: float, valve_diameter_m: float,
+                 heat_exchanger_diameter_m: float, max_iterations: int = 100, tolerance: float = 1e-8):
+        self.fluid = fluid
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance # [bar], [kg/s] and [K]
+
+        self._create_nodes(network_data)
+        self._create_branches(network_data, pipe_diameter_m, pipe_roughness_mm, pipe_u_w_per_m2k,
+                              valve_diameter_m, heat_exchanger_diameter_m)
+        self._create_boundary_conditions(network_data, grid_massflow)
+        self._create_friction_coefficients()
+        self._create_jacobian_pattern()
+
+        self.iterations = {}
+        self.reset()
+
+    @property
+    def junction_temperatures_k(self):
+        return self.node_temperatures_k[:self.num_junctions]
+
+    @property
+    def junction_pressures_bar(self):
+        return self.node_pressures_bar[:self.num_junctions]
+
+    @property
+    def heat_exchanger_massflows(self):
+        return self.branch_massflows[self._heat_exchanger_branches]
+
+    def reset(self):
+        '''Start the next solve from the initial values instead of the last solution.'''
+        self.node_pressures_bar  = np.full(self.num_nodes, self._grid_pressure_bar)
+        self.node_temperatures_k = np.full(self.num_nodes, self._initial_temperature_k)
+        self.branch_massflows    = 0.1 * self._branch_area * self.fluid.get_density(self._initial_temperature_k)
+
+    def solve(self, qext_w: np.ndarray, solve_hydraulics: bool = True, warm_start: bool = True):
+        '''
+        Solve for the heat extraction qext_w [W] of the heat exchangers (in the order of the network definition).
+        Without solve_hydraulics, the heat transfer is solved on the massflows of the last solve. Without
+        warm_start, the iterations start from the initial values instead of the last solution.
+        '''
+        if not warm_start:
+            massflows = self.branch_massflows
+            self.reset()
+            if not solve_hydraulics:
+                self.branch_massflows = massflows
+
+        self._branch_qext[self._heat_exchanger_branches] = qext_w
+
+        self.iterations = {}
+        if solve_hydraulics:
+            self.iterations["hydraulics"] = self._solve_hydraulics()
+        self.iterations["heat"] = self._solve_heat_transfer()
+
+    #--------------------------------------------------------------------------------------------------------#
+
+    def _create_nodes(self, network_data):
+        self._junction_index = {name: index for index, (name, _) in enumerate(network_data["junctions"])}
+        self.num_junctions = len(self._junction_index)
+
+        # Pipes with n sections get n - 1 internal nodes, numbered after the junctions
+        self._pipe_sections = np.array([pipe_data[4] for pipe_data in network_data["pipes"]], dtype=np.intp)
+        self.num_nodes = self.num_junctions + int(np.sum(self._pipe_sections - 1))
+
+    def _create_branches(self, network_data, pipe_diameter_m, pipe_roughness_mm, pipe_u_w_per_m2k,
+                         valve_diameter_m, heat_exchanger_diameter_m):
+        from_nodes, to_nodes = [], []
+        next_internal_node = self.num_junctions
+
+        for (_, from_junction, to_junction, _, sections) in network_data["pipes"]:
+            internal_nodes = list(range(next_internal_node, next_internal_node + sections - 1))
+            next_internal_node += sections - 1
+
+            pipe_nodes = [self._junction_index[from_junction], *internal_nodes, self._junction_index[to_junction]]
+            from_nodes += pipe_nodes[:-1]
+            to_nodes   += pipe_nodes[1:]
+
+        for (_, from_junction, to_junction, *_) in network_data["valves"] + network_data["heat_exchangers"]:
+            from_nodes.append(self._junction_index[from_junction])
+            to_nodes  .append(self._junction_index[to_junction])
+
+        num_pipe_sections = int(np.sum(self._pipe_sections))
+        num_valves = len(network_data["valves"])
+        num_heat_exchangers = len(network_data["heat_exchangers"])
+        self.num_branches = len(from_nodes)
+
+        self._from_nodes = np.array(from_nodes, dtype=np.intp)
+        self._to_nodes   = np.array(to_nodes  , dtype=np.intp)
+
+        pipe_lengths_m = [pipe_data[3] * 1000 / pipe_data[4] for pipe_data in network_data["pipes"]]
+        valve_loss_coefficients = [valve_data[3] for valve_data in network_data["valves"]]
+        ambient_temperature_k = network_data["external_grid"]["ambient_temperature"] + ZERO_CELSIUS_K
+
+        self._branch_length_m = np.concatenate([
+            np.repeat(pipe_lengths_m, self._pipe_sections), np.zeros(num_valves + num_heat_exchangers)])
+        self._branch_diameter_m = np.concatenate([
+            np.full(num_pipe_sections, pipe_diameter_m), np.full(num_valves, valve_diameter_m),
+            np.full(num_heat_exchangers, heat_exchanger_diameter_m)])
+        self._branch_roughness_m = np.concatenate([
+            np.full(num_pipe_sections, pipe_roughness_mm / 1000), np.full(num_valves + num_heat_exchangers, 1e-3)])
+        self._branch_loss_coefficient = np.concatenate([
+            np.zeros(num_pipe_sections), valve_loss_coefficients, np.zeros(num_heat_exchangers)])
+        self._branch_u_w_per_m2k = np.concatenate([
+            np.full(num_pipe_sections, pipe_u_w_per_m2k), np.zeros(num_valves + num_heat_exchangers)])
+        self._branch_ambient_k = np.full(self.num_branches, ambient_temperature_k)
+        self._branch_qext = np.zeros(self.num_branches)
+        self._branch_area = self._branch_diameter_m ** 2 * np.pi / 4
+
+        self._heat_exchanger_branches = np.arange(self.num_branches - num_heat_exchangers, self.num_branches)
+
+    def _create_boundary_conditions(self, network_data, grid_massflow):
+        external_grid = network_data["external_grid"]
+
+        self._slack_node = self._junction_index[external_grid["junction"]]
+        self._grid_pressure_bar = float(external_grid["pressure"])
+        self._grid_temperature_k = external_grid["supply_temperature"] + ZERO_CELSIUS_K
+        self._initial_temperature_k = self._grid_temperature_k
+
+        # Massflow leaving the network at each node (the grid sink)
+        self._node_outflow = np.zeros(self.num_nodes)
+        self._node_outflow[self._junction_index[external_grid["sink_node"]]] = grid_massflow
+
+        self._free_nodes = np.delete(np.arange(self.num_nodes), self._slack_node)
+
+    def _create_friction_coefficients(self):
+        '''Pressure drop [bar] = linear * m + quadratic * m|m|, with the laminar part of lambda in the linear term.'''
+        temperature_k = self._initial_temperature_k
+        density = self.fluid.get_density(temperature_k)
+        viscosity = self.fluid.get_viscosity(temperature_k)
+
+        diameter, area, length = self._branch_diameter_m, self._branch_area, self._branch_length_m
+        lambda_turbulent = 1 / (-2 * np.log10(self._branch_roughness_m / (3.71 * diameter))) ** 2
+        scale = 1 / (2 * area ** 2 * density * P_CONVERSION)
+
+        self._friction_linear    = scale * 64 * viscosity * area * length / diameter ** 2
+        self._friction_quadratic = scale * (lambda_turbulent * length / diameter + self._branch_loss_coefficient)
+
+    def _create_jacobian_pattern(self):
+        '''
+        Unknowns: pressures of all nodes but the slack node, then the branch massflows. Equations: the pressure
+        drop of every branch, then the mass balance of every node but the slack node.
+        '''
+        num_free_nodes = len(self._free_nodes)
+        free_node_column = np.full(self.num_nodes, -1, dtype=np.intp)
+        free_node_column[self._free_nodes] = np.arange(num_free_nodes)
+
+        branches = np.arange(self.num_branches)
+        massflow_columns = num_free_nodes + branches
+
+        # Pressure drop rows: +1 at the from node, -1 at the to node, -d(drop)/dm at the massflow
+        from_free, to_free = free_node_column[self._from_nodes] >= 0, free_node_column[self._to_nodes] >= 0
+        # Mass balance rows: -1 for branches leaving the node, +1 for branches entering it
+        balance_row = self.num_branches + free_node_column
+
+        rows = np.concatenate([
+            branches, branches[from_free], branches[to_free],
+            balance_row[self._from_nodes[from_free]], balance_row[self._to_nodes[to_free]]])
+        columns = np.concatenate([
+            massflow_columns, free_node_column[self._from_nodes[from_free]], free_node_column[self._to_nodes[to_free]],
+            massflow_columns[from_free], massflow_columns[to_free]])
+        values = np.concatenate([
+            np.zeros(self.num_branches), np.ones(from_free.sum()), -np.ones(to_free.sum()),
+            -np.ones(from_free.sum()), np.ones(to_free.sum())])
+
+        # Entry i of the COO triplets ends up at data[self._entry_position[i]] of the CSC matrix
+        size = num_free_nodes + self.num_branches
+        markers = sparse.csc_matrix((np.arange(1, len(rows) + 1, dtype=np.float64), (rows, columns)), shape=(size, size))
+        entry_position = np.empty(len(rows), dtype=np.intp)
+        entry_position[markers.data.astype(np.intp) - 1] = np.arange(len(rows))
+
+        self._jacobian = sparse.csc_matrix((values[markers.data.astype(np.intp) - 1], markers.indices, markers.indptr),
+                                           shape=(size, size))
+        self._friction_positions = entry_position[:self.num_branches]
+        self._num_free_nodes = num_free_nodes
+        self._column_order = None
+
+    #--------------------------------------------------------------------------------------------------------#
+
+    def _solve_hydraulics(self):
+        pressures, massflows = self.node_pressures_bar, self.branch_massflows
+        pressures[self._slack_node] = self._grid_pressure_bar
+
+        for iteration in range(1, self.max_iterations + 1):
+            absolute_massflows = np.abs(massflows)
+
+            pressure_residual = (pressures[self._from_nodes] - pressures[self._to_nodes]
+                                 - self._friction_linear * massflows - self._friction_quadratic * massflows * absolute_massflows)
+            balance_residual = (np.bincount(self._to_nodes, massflows, self.num_nodes)
+                                - np.bincount(self._from_nodes, massflows, self.num_nodes) - self._node_outflow)
+
+            self._jacobian.data[self._friction_positions] = -(self._friction_linear + 2 * self._friction_quadratic * absolute_massflows)
+            step = self._solve_jacobian(-np.concatenate([pressure_residual, balance_residual[self._free_nodes]]))
+
+            pressures[self._free_nodes] += step[:self._num_free_nodes]
+            massflows += step[self._num_free_nodes:]
+
+            if np.max(np.abs(step)) < self.tolerance:
+                return iteration
+
+        raise SolverNotConverged(f"The hydraulic calculation did not converge within {self.max_iterations} iterations.")
+
+    def _solve_jacobian(self, right_hand_side):
+        '''Factorise the Jacobian with the column ordering of the first factorisation and solve.'''
+        if self._column_order is None:
+            factorisation = self._factorise(self._jacobian, "COLAMD")
+            self._create_column_order(np.argsort(factorisation.perm_c))
+            return factorisation.solve(right_hand_side)
+
+        ordered = sparse.csc_matrix((self._jacobian.data[self._ordered_entries], self._ordered_indices, self._ordered_indptr),
+                                    shape=self._jacobian.shape)
+        step = np.empty_like(right_hand_side)
+        step[self._column_order] = self._factorise(ordered, "NATURAL").solve(right_hand_side)
+        return step
+
+    def _factorise(self, matrix, column_ordering):
+        try:
+            return splu(matrix, permc_spec=column_ordering)
+        except RuntimeError as error: # singular Jacobian
+            raise SolverNotConverged(f"The hydraulic calculation failed: {error}") from error
+
+    def _create_column_order(self, column_order):
+        indptr = self._jacobian.indptr
+        column_entries = [np.arange(indptr[column], indptr[column + 1]) for column in column_order]
+
+        self._column_order = column_order
+        self._ordered_entries = np.concatenate(column_entries)
+        self._ordered_indices = self._jacobian.indices[self._ordered_entries]
+        self._ordered_indptr = np.concatenate([[0], np.cumsum([len(entries) for entries in column_entries])])
+
+    def _solve_heat_transfer(self):
+        massflows = self.branch_massflows
+        flowing = np.abs(massflows) > ZERO_FLOW
+        absolute_massflows = np.abs(massflows[flowing])
+        upstream = np.where(massflows >= 0, self._from_nodes, self._to_nodes)[flowing]
+        downstream = np.where(massflows >= 0, self._to_nodes, self._from_nodes)[flowing]
+
+        # Nodes with inflow mix it, the grid node keeps the supply temperature, all other nodes have no flow
+        mixing = np.zeros(self.num_nodes, dtype=bool)
+        mixing[downstream] = True
+        mixing[self._slack_node] = False
+        fixed_temperatures = np.where(np.arange(self.num_nodes) == self._slack_node,
+                                      self._grid_temperature_k, STAGNANT_TEMPERATURE_K)
+
+        heat_loss = self._branch_u_w_per_m2k[flowing] * np.pi * self._branch_diameter_m[flowing] * self._branch_length_m[flowing]
+        ambient, qext = self._branch_ambient_k[flowing], self._branch_qext[flowing]
+        inflow = np.bincount(downstream, absolute_massflows, self.num_nodes)
+
+        temperatures = self.node_temperatures_k
+        outlet_temperatures = temperatures[downstream]
+        coupled = mixing[downstream]
+
+        for iteration in range(1, self.max_iterations + 1):
+            heat_capacity = (self.fluid.get_heat_capacity(temperatures[upstream])
+                             + self.fluid.get_heat_capacity(outlet_temperatures)) / 2
+            decay = np.exp(-heat_loss / (heat_capacity * absolute_massflows))
+
+            # Outlet temperature = ambient + (upstream temperature - ambient) * decay - qext / (cp * m)
+            # inflow(n) * T(n) - sum of m * decay * T(upstream) over the inflows of n = sum of m * outlet offset
+            offsets = ambient * (1 - decay) - qext / (heat_capacity * absolute_massflows)
+            diagonal = np.where(mixing, inflow, 1.0)
+            right_hand_side = np.where(mixing, np.bincount(downstream, absolute_massflows * offsets, self.num_nodes),
+                                       fixed_temperatures)
+
+            matrix = sparse.csr_matrix(
+                (np.concatenate([diagonal, -(absolute_massflows * decay)[coupled]]),
+                 (np.concatenate([np.arange(self.num_nodes), downstream[coupled]]),
+                  np.concatenate([np.arange(self.num_nodes), upstream[coupled]]))),
+                shape=(self.num_nodes, self.num_nodes))
+
+            new_temperatures = spsolve(matrix, right_hand_side)
+            outlet_temperatures = ambient + (new_temperatures[upstream] - ambient) * decay - qext / (heat_capacity * absolute_massflows)
+
+            change = np.max(np.abs(new_temperatures - temperatures))
+            temperatures[:] = new_temperatures
+
+            if change < self.tolerance:
+                return iteration
+
+        raise SolverNotConverged(f"The heat transfer calculation did not converge within {self.max_iterations} iterations.")
@@ -0,0 +1,140 @@
+import datetime as dt
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE    = 50_000 # rows per chunk read from the CSV file
+DEFAULT_WINDOW_CHUNKS = 2      # chunks kept in memory behind the prefetched one
+
+@dataclass
+class _Chunk:
+    timestamps: np.ndarray # [ns since epoch] int64
+    values    : np.ndarray # rows x selected columns
+
+def _read_next_chunk(chunk_iterator, columns):
+    try:
+        data = next(chunk_iterator)
+    except StopIteration:
+        return None
+
+    timestamps = data.index.values.astype("datetime64[ns]").view(np.int64)
+    values = data[columns].to_numpy(dtype=np.float64)
+
+    return _Chunk(timestamps=np.ascontiguousarray(timestamps), values=values)
+
+class StreamingCsvTimeseriesReader:
+    '''
+    Forward-only lookup of a time-sorted CSV timeseries that never holds the whole file in memory.
+
+    The file is read in chunks of `chunk_size` rows. Only the last `window_chunks` chunks are kept, and
+    the next chunk is parsed on a background thread while the simulation works on the current one, so
+    memory is bounded by (window_chunks + 1) * chunk_size rows regardless of the file length.
+
+    `columns` selects the value columns by name (default: the first value column). The window needs at least
+    two chunks: the chunk that holds the row at or before a query time may precede the chunk loaded for it.
+
+    The background thread and the open file are released by close(), or when the reader is garbage collected.
+    '''
+    def __init__(self, csv_path: str, columns: list = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 window_chunks: int = DEFAULT_WINDOW_CHUNKS):
+        if window_chunks < 2:
+            raise ValueError(f"The streaming window needs at least 2 chunks, but {window_chunks} was set.")
+
+        time_column, self.columns = self._resolve_columns(csv_path, columns)
+
+        self._chunk_iterator = pd.read_csv(
+            csv_path,
+            index_col=0,
+            parse_dates=True,
+            usecols=[time_column, *self.columns],
+            chunksize=chunk_size
+        )
+
+        self._chunks = deque(maxlen=window_chunks)
+        self._num_dropped_chunks = 0
+        self._exhausted = False
+
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._finalizer = weakref.finalize(self, self._release, self._executor, self._chunk_iterator)
+
+        self._prefetch_next_chunk()
+        self._load_next_chunk()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._finalizer()
+
+    @staticmethod
+    def _release(executor, chunk_iterator):
+        executor.shutdown(wait=True)
+        chunk_iterator.close()
+
+    @staticmethod
+    def _resolve_columns(csv_path, columns):
+        header = pd.read_csv(csv_path, nrows=0).columns.tolist()
+        time_column, value_columns = header[0], header[1:]
+
+        if columns is None:
+            return time_column, value_columns[:1]
+
+        unknown_columns = [column for column in columns if column not in value_columns]
+        if unknown_columns:
+            raise ValueError(f"Unknown columns {unknown_columns} in {csv_path}")
+
+        return time_column, list(columns)
+
+    def get_value_at_or_before(self, time: dt.datetime) -> float:
+        '''Value of the first selected column at or before `time`.'''
+        return float(self.get_row_at_or_before(time)[0])
+
+    def get_row_at_or_before(self, time: dt.datetime) -> np.ndarray:
+        '''Values of all selected columns at or before `time`.'''
+        timestamp = pd.Timestamp(time).value
+
+        self._advance_window_to(timestamp)
+
+        for chunk in reversed(self._chunks):
+            position = np.searchsorted(chunk.timestamps, timestamp, side="right") - 1
+            if position >= 0:
+                return chunk.values[position]
+
+        if self._num_dropped_chunks > 0:
+            raise ValueError("Invalid time: before the streaming window")
+        raise ValueError("Invalid time")
+
+    @property
+    def nbytes(self) -> int:
+        return sum(chunk.timestamps.nbytes + chunk.values.nbytes for chunk in self._chunks)
+
+    def _advance_window_to(self, timestamp):
+        while not self._exhausted and (not self._chunks or self._chunks[-1].timestamps[-1] < timestamp):
+            self._load_next_chunk()
+
+    def _load_next_chunk(self):
+        chunk = self._prefetched_chunk.result()
+
+        if chunk is None:
+            self._exhausted = True
+            return
+
+        if self._chunks and chunk.timestamps[0] < self._chunks[-1].timestamps[-1]:
+            raise ValueError("Streaming requires a CSV file sorted by time")
+
+        if len(self._chunks) == self._chunks.maxlen:
+            self._num_dropped_chunks += 1
+        self._chunks.append(chunk)
+
+        self._prefetch_next_chunk()
+
+    def _prefetch_next_chunk(self):
+        # The task must not reference the reader, so that the reader can be collected while it runs
+        self._prefetched_chunk = self._executor.submit(_read_next_chunk, self._chunk_iterator, self.columns)
@@ -0,0 +1,133 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+DEFAULT_MAX_UNUSED_ENTRIES = 8 # parsed files kept after their last reader is gone
+
+@dataclass(frozen=True)
+class Timeseries:
+    timestamps: np.ndarray # [ns since epoch] int64, sorted
+    values    : np.ndarray # rows x value columns, aligned with timestamps
+
+    def __post_init__(self):
+        self.timestamps.flags.writeable = False
+        self.values.flags.writeable = False
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + self.values.nbytes
+
+@dataclass
+class _CacheEntry:
+    timeseries: Timeseries
+    ref_count : int = 0
+
+class TimeseriesCache:
+    '''
+    Process-wide store of parsed timeseries files, shared by all readers of the same file.
+
+    Entries are keyed by (absolute path, mtime, size), so an edited file is parsed again. Entries that
+    are still referenced are never evicted; unreferenced entries are kept in LRU order up to
+    `max_unused_entries`.
+    '''
+    def __init__(self, max_unused_entries: int = DEFAULT_MAX_UNUSED_ENTRIES):
+        self.max_unused_entries = max_unused_entries
+
+        self.hits   = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._pending_loads = {} # key -> Event set once the load of the file finished or failed
+        self._lock = threading.Lock()
+
+    def acquire(self, path: str, loader: Callable[[str], Timeseries]):
+        '''
+        Return (key, timeseries) for the file, loading it with `loader` on a miss.
+        Every call must be paired with a call to release(key).
+
+        The file is loaded outside the cache lock, so readers of other files are not blocked. Concurrent misses
+        on the same key wait for the first one's load instead of parsing the file again.
+        '''
+        key = self._make_key(path)
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+
+                if entry is not None:
+                    self.hits += 1
+                    return key, self._reference(key, entry)
+
+                pending_load = self._pending_loads.get(key)
+                if pending_load is None:
+                    self.misses += 1
+                    pending_load = self._pending_loads[key] = threading.Event()
+                    break
+
+            # Another reader is loading the file; use its entry, or take over the load if it failed
+            pending_load.wait()
+
+        try:
+            timeseries = loader(key[0])
+        except BaseException:
+            with self._lock:
+                del self._pending_loads[key]
+            pending_load.set()
+            raise
+
+        with self._lock:
+            del self._pending_loads[key]
+            entry = _CacheEntry(timeseries=timeseries)
+            self._entries[key] = entry
+            timeseries = self._reference(key, entry)
+        pending_load.set()
+
+        return key, timeseries
+
+    def _reference(self, key, entry):
+        '''Count a new reader of the entry; must be called with the lock held.'''
+        entry.ref_count += 1
+        self._entries.move_to_end(key)
+        self._evict_unused_entries()
+
+        return entry.timeseries
+
+    def release(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+
+            entry.ref_count -= 1
+            self._evict_unused_entries()
+
+    def clear(self):
+        '''Drop all entries that are currently not referenced.'''
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.ref_count == 0]:
+                del self._entries[key]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(entry.timeseries.nbytes for entry in self._entries.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _make_key(path: str):
+        absolute_path = os.path.abspath(path)
+        file_stats = os.stat(absolute_path)
+        return absolute_path, file_stats.st_mtime_ns, file_stats.st_size
+
+    def _evict_unused_entries(self):
+        unused_keys = [key for key, entry in self._entries.items() if entry.ref_count <= 0]
+
+        for key in unused_keys[:max(len(unused_keys) - self.max_unused_entries, 0)]:
+            del self._entries[key]
+
+SHARED_TIMESERIES_CACHE = TimeseriesCache()
@@ -0,0 +1,184 @@
+'''
+Binary sidecar files for CSV timeseries.
+
+A sidecar is stored next to its CSV file (`<name>.csv.tsb`) and holds the parsed data in a form that can
+be memory-mapped directly, so repeated runs skip date parsing and only fault in the pages they read:
+
+    header     (HEADER_SIZE bytes, see HEADER_FORMAT)
+    timestamps (num_rows x int64, ns since epoch)
+    values     (num_rows x num_columns, float64 or float32, row-major)
+
+The header records size, mtime and SHA-256 of the source CSV. A sidecar whose size and mtime match is used
+as is; otherwise it is only used if the content hash still matches, and then takes over the new mtime so that
+later runs skip the hash again.
+
+Pre-convert all CSV files of a directory with:
+    python -m models.Auxiliary.timeseries_sidecar data/ [--float32]
+'''
+import os
+import sys
+import struct
+import hashlib
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.append('.')
+
+from models.Auxiliary.timeseries_cache import Timeseries
+
+SIDECAR_SUFFIX = ".tsb"
+MAGIC          = b"TSBIN\x00\x00\x00"
+VERSION        = 2 # version 1 only stored the first value column
+
+HEADER_FORMAT = "<8sIIqqqI32s" # magic, version, value itemsize, rows, source size, source mtime, columns, sha256
+HEADER_SIZE   = 128            # keeps the timestamp block 8-byte aligned
+
+SOURCE_MTIME_OFFSET = struct.calcsize("<8sIIqq") # position of the source mtime in the header
+
+VALUE_DTYPES = {4: np.dtype("<f4"), 8: np.dtype("<f8")}
+
+def sidecar_path(csv_path: str) -> str:
+    return csv_path + SIDECAR_SUFFIX
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+def write_sidecar(csv_path: str, timeseries: Timeseries, value_dtype=np.float64):
+    '''Write the sidecar atomically, so concurrent readers never see a partial file.'''
+    value_dtype = np.dtype(value_dtype).newbyteorder("<")
+    num_rows = len(timeseries.timestamps)
+    values = np.asarray(timeseries.values, dtype=value_dtype).reshape(num_rows, -1)
+    num_columns = values.shape[1]
+
+    source_stats = os.stat(csv_path)
+    header = struct.pack(
+        HEADER_FORMAT,
+        MAGIC,
+        VERSION,
+        value_dtype.itemsize,
+        num_rows,
+        source_stats.st_size,
+        source_stats.st_mtime_ns,
+        num_columns,
+        hash_file(csv_path)
+    ).ljust(HEADER_SIZE, b"\x00")
+
+    target_path = sidecar_path(csv_path)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(target_path)))
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(header)
+            file.write(np.ascontiguousarray(timeseries.timestamps, dtype="<i8").tobytes())
+            file.write(np.ascontiguousarray(values).tobytes())
+        os.replace(temporary_path, target_path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+def load_sidecar(csv_path: str):
+    '''Memory-map the sidecar of `csv_path`. Returns None if there is no up-to-date sidecar.'''
+    path = sidecar_path(csv_path)
+    if not os.path.exists(path):
+        return None
+
+    header = _read_header(path)
+    if header is None or not _is_up_to_date(header, csv_path, path):
+        return None
+
+    num_rows, num_columns, value_dtype = header["num_rows"], header["num_columns"], header["value_dtype"]
+    if num_rows == 0:
+        return Timeseries(timestamps=np.empty(0, dtype=np.int64), values=np.empty((0, num_columns), dtype=value_dtype))
+
+    timestamps = np.memmap(path, dtype="<i8", mode="r", offset=HEADER_SIZE, shape=(num_rows,))
+    values = np.memmap(
+        path,
+        dtype =value_dtype,
+        mode  ="r",
+        offset=HEADER_SIZE + timestamps.nbytes,
+        shape =(num_rows, num_columns)
+    )
+
+    return Timeseries(timestamps=timestamps, values=values)
+
+def _read_header(path):
+    with open(path, "rb") as file:
+        raw_header = file.read(HEADER_SIZE)
+
+    if len(raw_header) < HEADER_SIZE:
+        return None
+
+    magic, version, itemsize, num_rows, source_size, source_mtime, num_columns, source_hash = struct.unpack_from(
+        HEADER_FORMAT, raw_header
+    )
+
+    if magic != MAGIC or version != VERSION or itemsize not in VALUE_DTYPES:
+        return None
+
+    expected_size = HEADER_SIZE + num_rows * (8 + num_columns * itemsize)
+    if os.path.getsize(path) != expected_size:
+        return None
+
+    return {
+        "value_dtype" : VALUE_DTYPES[itemsize],
+        "num_rows"    : num_rows,
+        "num_columns" : num_columns,
+        "source_size" : source_size,
+        "source_mtime": source_mtime,
+        "source_hash" : source_hash,
+    }
+
+def _is_up_to_date(header, csv_path, path):
+    source_stats = os.stat(csv_path)
+
+    if source_stats.st_size != header["source_size"]:
+        return False
+    if source_stats.st_mtime_ns == header["source_mtime"]:
+        return True
+
+    # Same size, different mtime (e.g. after a fresh checkout): fall back to the content hash
+    if hash_file(csv_path) != header["source_hash"]:
+        return False
+
+    _update_source_mtime(path, source_stats.st_mtime_ns)
+    return True
+
+def _update_source_mtime(path, source_mtime):
+    '''Record the current mtime of the unchanged source, if the sidecar is writable.'''
+    try:
+        with open(path, "r+b") as file:
+            file.seek(SOURCE_MTIME_OFFSET)
+            file.write(struct.pack("<q", source_mtime))
+    except OSError:
+        pass
+
+def convert_directory(directory: str, value_dtype=np.float64):
+    from models.Auxiliary.csv_timeseries_reader import CsvTimeseriesReader
+
+    converted = []
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.lower().endswith(".csv"):
+            continue
+
+        csv_path = os.path.join(directory, file_name)
+        write_sidecar(csv_path, CsvTimeseriesReader.parse_csv(csv_path), value_dtype=value_dtype)
+        converted.append(csv_path)
+
+    return converted
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Pre-convert all CSV timeseries of a directory to binary sidecars.")
+    parser.add_argument("directory", help="directory containing the CSV files")
+    parser.add_argument("--float32", action="store_true", help="store values as float32 instead of float64")
+    args = parser.parse_args(arguments)
+
+    for csv_path in convert_directory(args.directory, np.float32 if args.float32 else np.float64):
+        print(f"Converted {csv_path} -> {sidecar_path(csv_path)}")
+
+if __name__ == "__main__":
+    main()
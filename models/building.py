@@ -1,6 +1,28 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 import datetime as dt
 
+import numpy as np
+from scipy.linalg import expm
+
+import sys
+sys.path.append('.')
+
+from models.Auxiliary.fleet import Fleet, empty_column
+from models.Auxiliary.numba_support import njit
+
+SETPOINT_CORRECTION_GAIN = 500 # [W/K] extra heat requested per kelvin below the setpoint
+
+INTEGRATORS = (
+    "euler",       # explicit Euler, heat transfer held constant over the step
+    "exponential", # exact solution of the linear two-node RC system over the step
+)
+
+MAX_REGIME_SUBDIVISIONS = 6 # halvings of a step whose heat transfer regime changes (down to step / 64)
+
+# Heat transfer regimes between tank and building (see Building._transfer_regime)
+NO_TRANSFER, TANK_LIMITED, DEMAND_LIMITED = range(3)
+
 @dataclass
 class Building:
     # Parameters
@@ -17,13 +39,36 @@ class Building:
     # State variables and outputs
     building_temperature: float = 15 # [°C] Interior building temperature
     tank_temperature    : float = 45 # [°C] Internal tank temperature 
+
+    # Config
+    integrator: str = "euler" # see INTEGRATORS
     
     def __post_init__(self):
         self.building_temperature = self.setpoint_temperature
+        self._state_unchanged = False # whether the last step left both temperatures exactly as they were
+
+        if self.integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator {self.integrator}. Choose one of {INTEGRATORS}.")
 
     def step(self, time_step: dt.timedelta):
         time_step_hours = time_step.total_seconds() / 3600
+        previous_state = (self.building_temperature, self.tank_temperature)
+
+        if self.integrator == "exponential":
+            self._step_exponential(time_step_hours)
+        else:
+            self._step_euler(time_step_hours)
 
+        self._state_unchanged = (self.building_temperature, self.tank_temperature) == previous_state
+
+    def is_steady_state(self):
+        '''
+        True if the last step was a fixed point, so another step with the same inputs and time step would not
+        change the building either (used by BasicSimulator.skip_unchanged).
+        '''
+        return self._state_unchanged
+
+    def _step_euler(self, time_step_hours):
         heat_loss_to_outside = self._compute_heat_loss_to_outside()
 
         actual_heat_transfer_to_building = self._compute_actual_heat_transfer_to_building(heat_loss_to_outside)
@@ -37,7 +82,7 @@ class Building:
 
     def _compute_actual_heat_transfer_to_building(self, heat_loss_to_outside: float):
         required_heat_to_maintain_temp = heat_loss_to_outside
-        temperature_dependent_correction = 500 * (self.setpoint_temperature - self.building_temperature)
+        temperature_dependent_correction = SETPOINT_CORRECTION_GAIN * (self.setpoint_temperature - self.building_temperature)
 
         required_heat_to_reach_setpoint = required_heat_to_maintain_temp + temperature_dependent_correction
 
@@ -58,4 +103,179 @@ class Building:
         heat_power_difference = self.heat_input - actual_heat_transfer_to_building
         temperature_change = heat_power_difference * time_step_hours / self.thermal_capacity_tank
 
-        self.tank_temperature += temperature_change
\ No newline at end of file
+        self.tank_temperature += temperature_change
+
+    # -------------------------------------------------------------------------------------------------------------#
+    # Exact integration: within each regime of the clamped heat transfer, the building is a linear two-node RC
+    # system with constant inputs, which is solved exactly with a precomputed matrix exponential. A step whose
+    # regime changes before its end is halved (up to MAX_REGIME_SUBDIVISIONS times).
+
+    def _step_exponential(self, time_step_hours):
+        state = (self.building_temperature, self.tank_temperature)
+
+        self.building_temperature, self.tank_temperature = self._propagate_exactly(state, time_step_hours)
+
+    def _propagate_exactly(self, state, hours, subdivisions=0):
+        regime = self._transfer_regime(*state)
+        end_state = self._propagate_in_regime(state, hours, regime)
+
+        if subdivisions == MAX_REGIME_SUBDIVISIONS or self._transfer_regime(*end_state) == regime:
+            return end_state
+
+        half_hours = hours / 2
+        mid_state = self._propagate_exactly(state, half_hours, subdivisions + 1)
+        return self._propagate_exactly(mid_state, half_hours, subdivisions + 1)
+
+    def _transfer_regime(self, building_temperature, tank_temperature):
+        '''Which branch of _compute_actual_heat_transfer_to_building is active in the given state.'''
+        tank_limited_transfer = self.tank_to_building_transfer * (tank_temperature - building_temperature)
+        required_heat_to_reach_setpoint = (
+            self.heat_loss_coefficient * (building_temperature - self.outdoor_temperature)
+            + SETPOINT_CORRECTION_GAIN * (self.setpoint_temperature - building_temperature)
+        )
+
+        if min(tank_limited_transfer, required_heat_to_reach_setpoint) <= 0.0:
+            return NO_TRANSFER
+        elif tank_limited_transfer <= required_heat_to_reach_setpoint:
+            return TANK_LIMITED
+        else:
+            return DEMAND_LIMITED
+
+    def _propagate_in_regime(self, state, hours, regime):
+        transition = _exact_transition_matrix(
+            regime,
+            hours,
+            self.thermal_capacity_building,
+            self.thermal_capacity_tank,
+            self.heat_loss_coefficient,
+            self.tank_to_building_transfer
+        )
+        extended_state = (*state, self.outdoor_temperature, self.heat_input, self.setpoint_temperature)
+
+        return tuple(sum(factor * value for factor, value in zip(row, extended_state)) for row in transition)
+
+@lru_cache(maxsize=1024)
+def _exact_transition_matrix(regime, hours, capacity_building, capacity_tank, heat_loss_coefficient, transfer_coefficient):
+    '''
+    Rows of exp(M * hours) for the building and tank temperature, where M is the system matrix of the
+    extended state [building temperature, tank temperature, outdoor temperature, heat input, setpoint]
+    (inputs are constant over the step). Cached, so each step size and building type is computed once.
+    '''
+    Cb, Ct, H, k, G = capacity_building, capacity_tank, heat_loss_coefficient, transfer_coefficient, SETPOINT_CORRECTION_GAIN
+
+    system_matrix = np.zeros((5, 5))
+    if regime == TANK_LIMITED:     # Q = k * (T_tank - T_building)
+        system_matrix[0, :] = [-(k + H) / Cb,  k / Cb, H / Cb, 0     , 0     ]
+        system_matrix[1, :] = [  k / Ct     , -k / Ct, 0     , 1 / Ct, 0     ]
+    elif regime == DEMAND_LIMITED: # Q = H * (T_building - T_outdoor) + G * (T_setpoint - T_building)
+        system_matrix[0, :] = [-G / Cb      ,  0     , 0     , 0     , G / Cb]
+        system_matrix[1, :] = [(G - H) / Ct ,  0     , H / Ct, 1 / Ct, -G / Ct]
+    else:                          # Q = 0
+        system_matrix[0, :] = [-H / Cb      ,  0     , H / Cb, 0     , 0     ]
+        system_matrix[1, :] = [  0          ,  0     , 0     , 1 / Ct, 0     ]
+
+    return tuple(tuple(row) for row in expm(system_matrix * hours)[:2].tolist())
+
+@dataclass
+class BuildingFleet(Fleet):
+    '''
+    Struct-of-arrays version of Building: every attribute is an array with one entry per building, and
+    all buildings are stepped in one vectorized pass (step) or one compiled loop (step_compiled). The
+    arithmetic mirrors Building operation by operation, so results match the scalar model bit-for-bit.
+    '''
+    model_class = Building
+
+    # Parameters
+    thermal_capacity_building: np.ndarray = field(default_factory=empty_column) # [Wh/K]
+    thermal_capacity_tank    : np.ndarray = field(default_factory=empty_column) # [Wh/K]
+    heat_loss_coefficient    : np.ndarray = field(default_factory=empty_column) # [W/K]
+    tank_to_building_transfer: np.ndarray = field(default_factory=empty_column) # [W/K]
+    setpoint_temperature     : np.ndarray = field(default_factory=empty_column) # [°C]
+
+    # Inputs
+    outdoor_temperature: np.ndarray = field(default_factory=empty_column) # [°C]
+    heat_input         : np.ndarray = field(default_factory=empty_column) # [W]
+
+    # State variables and outputs
+    building_temperature: np.ndarray = field(default_factory=empty_column) # [°C]
+    tank_temperature    : np.ndarray = field(default_factory=empty_column) # [°C]
+
+    def add(self, num: int, **params) -> int:
+        if params.get("integrator", "euler") != "euler":
+            raise ValueError("BuildingFleet only supports the explicit Euler integrator.")
+
+        return super().add(num, **params)
+
+    def step_compiled(self, time_step_hours: float):
+        step_buildings_kernel(
+            self.thermal_capacity_building,
+            self.thermal_capacity_tank,
+            self.heat_loss_coefficient,
+            self.tank_to_building_transfer,
+            self.setpoint_temperature,
+            self.outdoor_temperature,
+            self.heat_input,
+            self.building_temperature,
+            self.tank_temperature,
+            time_step_hours
+        )
+
+    def step(self, time_step_hours: float):
+        heat_loss_to_outside = self._compute_heat_loss_to_outside()
+
+        actual_heat_transfer_to_building = self._compute_actual_heat_transfer_to_building(heat_loss_to_outside)
+
+        self._update_building_temperature(time_step_hours, actual_heat_transfer_to_building, heat_loss_to_outside)
+        self._update_tank_temperature    (time_step_hours, actual_heat_transfer_to_building)
+
+    def _compute_heat_loss_to_outside(self):
+        temperature_difference = self.building_temperature - self.outdoor_temperature
+        return self.heat_loss_coefficient * temperature_difference
+
+    def _compute_actual_heat_transfer_to_building(self, heat_loss_to_outside: np.ndarray):
+        required_heat_to_maintain_temp = heat_loss_to_outside
+        temperature_dependent_correction = SETPOINT_CORRECTION_GAIN * (self.setpoint_temperature - self.building_temperature)
+
+        required_heat_to_reach_setpoint = required_heat_to_maintain_temp + temperature_dependent_correction
+
+        actual_heat_transfer_to_building = np.minimum(
+            self.tank_to_building_transfer * (self.tank_temperature - self.building_temperature),
+            required_heat_to_reach_setpoint
+        )
+
+        return np.maximum(actual_heat_transfer_to_building, 0.0) # no cooling by tank
+
+    def _update_building_temperature(self, time_step_hours, actual_heat_transfer_to_building, heat_loss_to_outside):
+        heat_power_difference = actual_heat_transfer_to_building - heat_loss_to_outside
+        temperature_change = heat_power_difference * time_step_hours / self.thermal_capacity_building
+
+        self.building_temperature += temperature_change
+
+    def _update_tank_temperature(self, time_step_hours, actual_heat_transfer_to_building):
+        heat_power_difference = self.heat_input - actual_heat_transfer_to_building
+        temperature_change = heat_power_difference * time_step_hours / self.thermal_capacity_tank
+
+        self.tank_temperature += temperature_change
+
+@njit(cache=True)
+def step_buildings_kernel(thermal_capacity_building, thermal_capacity_tank, heat_loss_coefficient,
+                          tank_to_building_transfer, setpoint_temperature, outdoor_temperature, heat_input,
+                          building_temperature, tank_temperature, time_step_hours):
+    '''Building.step (explicit Euler) for every building, updating the temperature arrays in place.'''
+    for i in range(len(building_temperature)):
+        heat_loss_to_outside = heat_loss_coefficient[i] * (building_temperature[i] - outdoor_temperature[i])
+
+        temperature_dependent_correction = SETPOINT_CORRECTION_GAIN * (setpoint_temperature[i] - building_temperature[i])
+        required_heat_to_reach_setpoint = heat_loss_to_outside + temperature_dependent_correction
+
+        actual_heat_transfer_to_building = min(
+            tank_to_building_transfer[i] * (tank_temperature[i] - building_temperature[i]),
+            required_heat_to_reach_setpoint
+        )
+        actual_heat_transfer_to_building = max(actual_heat_transfer_to_building, 0.0)
+
+        building_power_difference = actual_heat_transfer_to_building - heat_loss_to_outside
+        building_temperature[i] += building_power_difference * time_step_hours / thermal_capacity_building[i]
+
+        tank_power_difference = heat_input[i] - actual_heat_transfer_to_building
+        tank_temperature[i] += tank_power_difference * time_step_hours / thermal_capacity_tank[i]
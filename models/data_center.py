@@ -1,7 +1,17 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import sys
+sys.path.append('.')
+
+from models.Auxiliary.fleet import Fleet, empty_column
+from models.Auxiliary.numba_support import njit
 
 @dataclass
 class DataCenter:
+    STATELESS = True # outputs only depend on inputs and parameters (see BasicSimulator.skip_unchanged)
+
     # Parameters
     max_computing_power       : float        # [W]  Maximum computing power demand
     max_cooling_power         : float        # [W]  Maximum cooling power demand
@@ -56,3 +66,98 @@ class DataCenter:
     def _compute_excess_heat(self):
         excess_pv = max(0, -self.pv_input - self.total_power_demand)
         return -excess_pv * self.heat_generation_efficiency
+
+
+@dataclass
+class DataCenterFleet(Fleet):
+    '''
+    Struct-of-arrays version of DataCenter with one array entry per data center (or other waste-heat source).
+    All of them are stepped together, either vectorized and branch-free with NumPy (step) or in a compiled
+    loop (step_compiled). total_heat_output is stored as a column, so reading it needs no computation.
+    '''
+    model_class = DataCenter
+
+    # Parameters
+    max_computing_power       : np.ndarray = field(default_factory=empty_column) # [W]
+    max_cooling_power         : np.ndarray = field(default_factory=empty_column) # [W]
+    cooling_threshold         : np.ndarray = field(default_factory=empty_column) # [°C]
+    max_temperature           : np.ndarray = field(default_factory=empty_column) # [°C]
+    heat_generation_efficiency: np.ndarray = field(default_factory=empty_column) # [-]
+    _cooling_rate             : np.ndarray = field(default_factory=empty_column) # [W/K] derived
+
+    # Inputs
+    outdoor_temperature       : np.ndarray = field(default_factory=empty_column) # [°C]
+    pv_input                  : np.ndarray = field(default_factory=empty_column) # [W]
+
+    # Outputs
+    electricity_consumption   : np.ndarray = field(default_factory=empty_column) # [W]
+    waste_heat                : np.ndarray = field(default_factory=empty_column) # [W]
+    excess_heat               : np.ndarray = field(default_factory=empty_column) # [W]
+    total_power_demand        : np.ndarray = field(default_factory=empty_column) # [W]
+    total_heat_output         : np.ndarray = field(default_factory=empty_column) # [W]
+
+    def step(self):
+        self.total_power_demand      = self._compute_total_power_demand()
+        self.electricity_consumption = self._compute_electricity_consumption()
+        self.waste_heat              = self._compute_waste_heat()
+        self.excess_heat             = self._compute_excess_heat()
+        self.total_heat_output       = self.waste_heat + self.excess_heat
+
+    def _compute_cooling_demand(self):
+        temperature_difference = self.outdoor_temperature - self.cooling_threshold
+        cooling_demand = np.minimum(self._cooling_rate * temperature_difference, self.max_cooling_power)
+        cooling_demand = np.maximum(cooling_demand, 0)
+
+        return np.where(self.outdoor_temperature < self.cooling_threshold, 0.0, cooling_demand)
+
+    def _compute_total_power_demand(self):
+        return self.max_computing_power + self._compute_cooling_demand()
+
+    def _compute_electricity_consumption(self):
+        net_power_demand = self.total_power_demand + self.pv_input
+        return np.maximum(0, net_power_demand)
+
+    def _compute_waste_heat(self):
+        return -self.total_power_demand * 0.5
+
+    def _compute_excess_heat(self):
+        excess_pv = np.maximum(0, -self.pv_input - self.total_power_demand)
+        return -excess_pv * self.heat_generation_efficiency
+
+    def step_compiled(self):
+        step_data_centers_kernel(
+            self.max_computing_power,
+            self.max_cooling_power,
+            self.cooling_threshold,
+            self.heat_generation_efficiency,
+            self._cooling_rate,
+            self.outdoor_temperature,
+            self.pv_input,
+            self.electricity_consumption,
+            self.waste_heat,
+            self.excess_heat,
+            self.total_power_demand,
+            self.total_heat_output
+        )
+
+@njit(cache=True)
+def step_data_centers_kernel(max_computing_power, max_cooling_power, cooling_threshold, heat_generation_efficiency,
+                             cooling_rate, outdoor_temperature, pv_input, electricity_consumption, waste_heat,
+                             excess_heat, total_power_demand, total_heat_output):
+    '''DataCenter.step for every data center, writing the output arrays in place.'''
+    for i in range(len(total_power_demand)):
+        if outdoor_temperature[i] < cooling_threshold[i]:
+            cooling_demand = 0.0
+        else:
+            cooling_demand = cooling_rate[i] * (outdoor_temperature[i] - cooling_threshold[i])
+            cooling_demand = min(cooling_demand, max_cooling_power[i])
+            cooling_demand = max(cooling_demand, 0.0)
+
+        total_power_demand[i] = max_computing_power[i] + cooling_demand
+        electricity_consumption[i] = max(0.0, total_power_demand[i] + pv_input[i])
+        waste_heat[i] = -total_power_demand[i] * 0.5
+
+        excess_pv = max(0.0, -pv_input[i] - total_power_demand[i])
+        excess_heat[i] = -excess_pv * heat_generation_efficiency[i]
+
+        total_heat_output[i] = waste_heat[i] + excess_heat[i]
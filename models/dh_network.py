@@ -1,25 +1,85 @@
 import sys
 import json
+from collections import OrderedDict
 from dataclasses import dataclass, field
+import numpy as np
 import pandapipes as pp
 import pandapipes.control as pp_control
+from pandapipes.pipeflow import PipeflowNotConverged
+from pandapipes.idx_node import PINIT
+
+try:
+    from pandapipes.idx_branch import MDOTINIT as BRANCH_FLOW_INIT
+except ImportError: # pandapipes before 0.9 solves for branch velocities
+    from pandapipes.idx_branch import VINIT as BRANCH_FLOW_INIT
+
+sys.path.append('.')
+
+from models.Auxiliary.sparse_network_solver import SparseNetworkSolver, SolverNotConverged
 
 if not sys.warnoptions:
     import warnings
 
 ABSOLUTE_ZERO = -273.15 # [degC]
 
+# Parameters of the network elements that the network definition does not specify
+PIPE_DIAMETER_M           = 0.1  # [m]
+PIPE_ROUGHNESS_MM         = 0.01 # [mm]
+PIPE_U_W_PER_M2K          = 1.5  # [W/(m2 K)] heat transfer coefficient to the ambient
+VALVE_DIAMETER_M          = 0.1  # [m]
+HEAT_EXCHANGER_DIAMETER_M = 0.1  # [m]
+
+PIPEFLOW_OPTIONS = {"transient": False, "mode": "all", "max_iter": 100, "heat_transfer": True}
+
+# single               : one converged solve per step; only networks with controllers run the control loop, whose
+#                        final results are used
+# control_then_pipeflow: control loop followed by a separate pipeflow in every step
+SOLVE_STRATEGIES = ("single", "control_then_pipeflow")
+
+# pandapipes: pandapipes pipeflow on the pandapipes network
+# sparse    : SparseNetworkSolver on the arrays of the network definition; the pandapipes network only holds the
+#             inputs and its result tables stay empty
+SOLVER_BACKENDS = ("pandapipes", "sparse")
+
+# Inputs of the pandapipes network that change the massflows; a change of one of them since the last hydraulic
+# solve forces the next one (heat exchanger demands only change the temperatures)
+HYDRAULIC_INPUT_COLUMNS = (
+    ("ext_grid"      , ("p_bar", "in_service")),
+    ("sink"          , ("mdot_kg_per_s", "scaling", "in_service")),
+    ("source"        , ("mdot_kg_per_s", "scaling", "in_service")),
+    ("pipe"          , ("loss_coefficient", "in_service")),
+    ("valve"         , ("opened", "loss_coefficient")),
+    ("heat_exchanger", ("loss_coefficient", "in_service")),
+    ("controller"    , ("in_service",)),
+)
+
 def celsius_to_kelvin(degree_celsius: float):
     return degree_celsius - ABSOLUTE_ZERO
 
 def kelvin_to_celsius(degree_kelvin: float):
     return degree_kelvin + ABSOLUTE_ZERO
 
-@dataclass
+def _consumer_array_property(array_name):
+    def get_value(consumer):
+        return float(getattr(consumer.network, array_name)[consumer.index])
+
+    def set_value(consumer, value):
+        getattr(consumer.network, array_name)[consumer.index] = value
+
+    return property(get_value, set_value)
+
 class Consumer:
-    heat_consumption  : float # [W]
-    supply_temperature: float # [degC]
-    massflow          : float # [kg/s]
+    '''
+    Inputs and outputs of one consumer: a view on its entries in the consumer arrays of the DHNetwork, so the
+    network can read and write all consumers at once.
+    '''
+    heat_consumption   = _consumer_array_property("consumer_heat_consumption")   # [W]
+    supply_temperature = _consumer_array_property("consumer_supply_temperature") # [degC]
+    massflow           = _consumer_array_property("consumer_massflow")           # [kg/s]
+
+    def __init__(self, network, index: int):
+        self.network = network
+        self.index = index
 
 @dataclass
 class DHNetwork:
@@ -31,61 +91,334 @@ class DHNetwork:
 
     controlled_systems: dict = field(init=False) # Inputs and outputs for each consumer 
 
+    # Inputs and outputs of the consumers, one entry per heat exchanger of the network definition (see
+    # initialize_controlled_systems); heat exchangers without consumer keep their initial demand
+    consumer_heat_consumption  : np.ndarray = field(init=False) # [W]
+    consumer_supply_temperature: np.ndarray = field(init=False) # [degC]
+    consumer_massflow          : np.ndarray = field(init=False) # [kg/s]
+
     grid_return_temperature: float = 25 # [degC]
 
     # Config
-    network_definition_path: str = "" # path to JSON-based network defintion
+    network_definition_path: str   = ""       # path to JSON-based network defintion
+    warm_start             : bool  = False    # initialize each solve from the results of the previous step (see _initialize_from_previous_results)
+    solve_strategy         : str   = "single" # see SOLVE_STRATEGIES
+    result_cache_size      : int   = 0        # solved demand vectors kept for reuse (0 disables the cache)
+    result_cache_tolerance : float = 1.0      # [W] quantisation step of the demands in the cache key
+    hydraulics_interval    : int   = 1        # solve hydraulics at least every N steps, heat only in between (see _needs_hydraulic_solve)
+    solver_backend         : str   = "pandapipes" # see SOLVER_BACKENDS
+    count_solver_iterations: bool  = False    # pandapipes: solve the stages in separate pipeflows to count their iterations
+
+    # Statistics
+    solver_iterations: dict = field(init=False, default_factory=dict) # Newton iterations of all solves, by solver stage (see _record_solver_iterations)
+    cold_restarts    : int  = field(init=False, default=0)            # warm-started solves repeated from a cold start
+    cache_hits       : int  = field(init=False, default=0)            # steps answered from the result cache
+    cache_misses     : int  = field(init=False, default=0)            # steps solved despite the enabled cache
+    hydraulic_solves : int  = field(init=False, default=0)            # solves of hydraulics and heat transfer
+    heat_only_solves : int  = field(init=False, default=0)            # heat transfer solves on frozen hydraulics
 
     def step(self, time):
         self.sim_time = time
         
         self._update_inputs()
-        self._run_computations()
-        self._update_outputs()
+
+        if self.result_cache_size > 0:
+            self._step_with_result_cache()
+        else:
+            self._run_computations()
+            self._update_outputs()
 
     def __post_init__(self):
+        if self.solve_strategy not in SOLVE_STRATEGIES:
+            raise ValueError(f"DHNetwork supports the solve strategies {SOLVE_STRATEGIES}, but {self.solve_strategy} was set.")
+        if self.solver_backend not in SOLVER_BACKENDS:
+            raise ValueError(f"DHNetwork supports the solver backends {SOLVER_BACKENDS}, but {self.solver_backend} was set.")
+        if self.result_cache_tolerance <= 0:
+            raise ValueError(f"The result cache tolerance must be positive, but {self.result_cache_tolerance} was set.")
+
+        self._result_cache = OrderedDict() # cache key -> (supply temperatures, massflows, grid return temperature)
+
         self._load_network_data()
         self._create_network()
+        self._index_network_elements()
+        self._store_cold_start_values()
+
+        if self.solver_backend == "sparse":
+            self._sparse_solver = self._create_sparse_solver()
 
     def _load_network_data(self):
         with open(self.network_definition_path, "r") as file:
             self._network_data = json.load(file)
 
-    def initialize_controlled_systems(self, consumers):
-        self.controlled_systems = {}
+    def initialize_controlled_systems(self, consumers, heat_exchanger_positions=None):
+        '''
+        Connect each consumer to the heat exchanger at its position in the network definition (the position of its
+        channel; by default, the i-th consumer to the i-th heat exchanger). Consumers at the same position share
+        one heat exchanger and its inputs and outputs.
+        '''
+        heat_exchangers = self._network_data["heat_exchangers"]
 
-        hex_names = [name for name, *_ in self._network_data["heat_exchangers"]]
+        if heat_exchanger_positions is None:
+            consumers = consumers[:len(heat_exchangers)]
+            heat_exchanger_positions = range(len(consumers))
 
-        self.hex_to_consumer = dict(zip(hex_names, consumers))
-        self.consumer_to_hex = dict(zip(consumers, hex_names))
+        positions = [int(position) for position in heat_exchanger_positions]
+        if positions and max(positions) >= len(heat_exchangers):
+            raise ValueError(
+                f"The network definition has {len(heat_exchangers)} heat exchangers, but a consumer was connected to "
+                f"position {max(positions)}."
+            )
 
-        default_supply_temperature = self._network_data["external_grid"]["supply_temperature"]
-        default_massflow = self.grid_massflow
+        hex_names = [name for name, *_ in heat_exchangers]
 
-        for hex_name, _, _, init_consumption in self._network_data["heat_exchangers"]:
-            consumer = self.hex_to_consumer[hex_name]
-            self.controlled_systems[consumer] = Consumer(
-                heat_consumption=init_consumption,
-                supply_temperature=default_supply_temperature,
-                massflow=default_massflow
-            )
+        self.consumer_to_hex = {consumer: hex_names[position] for consumer, position in zip(consumers, positions)}
+        self.hex_to_consumer = {}
+        for consumer, hex_name in self.consumer_to_hex.items():
+            self.hex_to_consumer.setdefault(hex_name, consumer)
+
+        self.consumer_heat_consumption   = np.array([init_consumption for *_, init_consumption in heat_exchangers], dtype=float)
+        self.consumer_supply_temperature = np.full(len(heat_exchangers), self._network_data["external_grid"]["supply_temperature"], dtype=float)
+        self.consumer_massflow           = np.full(len(heat_exchangers), self.grid_massflow, dtype=float)
+
+        self.controlled_systems = {consumer: Consumer(self, position) for consumer, position in zip(consumers, positions)}
+
+        # Row positions of the heat exchangers and of their supply junctions, for reading and writing all consumers
+        # at once
+        self._consumer_hex_rows = np.array([self._hex_rows[name] for name in hex_names], dtype=np.intp)
+        self._consumer_supply_junction_rows = np.array(
+            [self._junction_rows[from_junction] for _, from_junction, *_ in heat_exchangers], dtype=np.intp)
+
+    @property
+    def input_arrays(self):
+        '''Consumer inputs by channel attribute, written in place by the simulator (see BasicMulticontrollerSimulator).'''
+        return {"heat_consumption": self.consumer_heat_consumption}
 
     def _update_inputs(self):
         self._update_consumer_heat_consumption()
 
     def _update_consumer_heat_consumption(self):
-        for consumer_name, consumer in self.controlled_systems.items():
-            hex_name = self.consumer_to_hex[consumer_name]
-            heat_consumption = consumer.heat_consumption
+        self.network.heat_exchanger.iloc[self._consumer_hex_rows, self._qext_column] = self.consumer_heat_consumption
+
+    @property
+    def cache_hit_rate(self):
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
 
-            self.network.heat_exchanger.loc[
-                self.network.heat_exchanger['name'] == hex_name,
-                "qext_w"
-            ] = heat_consumption
+    @property
+    def cache_entries(self):
+        return len(self._result_cache)
+
+    def _step_with_result_cache(self):
+        '''
+        Reuse the outputs of an earlier solve whose demands fall into the same quantisation cells, otherwise solve
+        and store the outputs, evicting the least recently used entry when the cache is full.
+        '''
+        key = self._result_cache_key()
+        cached_results = self._result_cache.get(key)
+
+        if cached_results is None:
+            self.cache_misses += 1
+            self._run_computations()
+            self._update_outputs()
+
+            self._result_cache[key] = (
+                self.consumer_supply_temperature.copy(),
+                self.consumer_massflow.copy(),
+                self.grid_return_temperature
+            )
+            if len(self._result_cache) > self.result_cache_size:
+                self._result_cache.popitem(last=False)
+        else:
+            self.cache_hits += 1
+            self._result_cache.move_to_end(key)
+
+            supply_temperatures, massflows, self.grid_return_temperature = cached_results
+            self.consumer_supply_temperature[:] = supply_temperatures
+            self.consumer_massflow[:] = massflows
+
+    def _result_cache_key(self):
+        '''
+        Demands of all heat exchangers rounded to multiples of the tolerance, with the temperatures of the
+        external grid. Demands closer than the tolerance can still round to different cells.
+        '''
+        qext_w = self.network.heat_exchanger['qext_w'].to_numpy()
+        quantised_demands = np.rint(qext_w / self.result_cache_tolerance).astype(np.int64)
+
+        external_grid = self._network_data["external_grid"]
+
+        return (
+            quantised_demands.tobytes(),
+            external_grid["ambient_temperature"],
+            external_grid["supply_temperature"]
+        )
 
     def _run_computations(self):
-        self._run_hydraulic_control()
-        self._run_static_pipeflow()
+        warm_started = self.warm_start and self._initialize_from_previous_results()
+
+        try:
+            self._solve()
+        except (PipeflowNotConverged, SolverNotConverged):
+            if not warm_started:
+                raise
+
+            self.cold_restarts += 1
+            self._reset_initial_values()
+            self._solve()
+
+        self._has_results = True
+
+    def _initialize_from_previous_results(self):
+        '''
+        Start the solve from the junction pressures and temperatures of the previous step (pandapipes derives its
+        initial values from pn_bar and tfluid_k). Returns False if there are no previous results yet.
+
+        Only the heat stage of pandapipes gains from this: its hydraulic stage starts the branch massflows from a
+        fixed value that cannot be set from outside (sol_vec is read only for mode="heat"), so it takes as many
+        iterations as from a cold start. The results differ from a cold start within the solver tolerances
+        (about 1e-3 K). The sparse backend also starts its hydraulics from the previous massflows.
+        '''
+        if not self._has_results:
+            return False
+
+        # The sparse solver starts from its last solution by itself
+        if self.solver_backend == "sparse":
+            return True
+
+        pressures_bar  = self.network.res_junction['p_bar'].to_numpy()
+        temperatures_k = self.network.res_junction['t_k'].to_numpy()
+
+        # Junctions without results (e.g. disconnected ones) keep their cold start values
+        self.network.junction['pn_bar']   = np.where(np.isnan(pressures_bar) , self._cold_pressures_bar , pressures_bar)
+        self.network.junction['tfluid_k'] = np.where(np.isnan(temperatures_k), self._cold_temperatures_k, temperatures_k)
+
+        return True
+
+    def _reset_initial_values(self):
+        '''Cold start values for the next solve, which also re-solves the hydraulics.'''
+        self.network.junction['pn_bar']   = self._cold_pressures_bar
+        self.network.junction['tfluid_k'] = self._cold_temperatures_k
+
+        if self.solver_backend == "sparse":
+            self._sparse_solver.reset()
+
+        self._hydraulic_solution = None
+
+    def _record_solver_iterations(self):
+        '''
+        Add the iterations of the last pandapipes stage to solver_iterations. pandapipes keeps only those of the
+        last stage of a pipeflow, so with count_solver_iterations the stages run as separate pipeflows (see
+        _run_stage_pipeflows). The pipeflows inside the pandapipes control loop are not counted.
+        '''
+        for key, value in self.network.get("_internal_results", {}).items():
+            if key.startswith("iterations_"):
+                stage = key[len("iterations_"):]
+                self.solver_iterations[stage] = self.solver_iterations.get(stage, 0) + int(value)
+
+    def _solve(self):
+        self._hydraulics_solved = self._needs_hydraulic_solve()
+
+        if self.solver_backend == "sparse":
+            self._run_sparse_solver()
+        else:
+            self._run_pandapipes()
+
+        if self._hydraulics_solved:
+            self.hydraulic_solves += 1
+            self._store_hydraulic_solution()
+        else:
+            self._steps_since_hydraulic_solve += 1
+            self.heat_only_solves += 1
+
+    def _run_pandapipes(self):
+        if not self._hydraulics_solved:
+            self._run_heat_transfer_pipeflow()
+        elif self.solve_strategy == "control_then_pipeflow":
+            self._run_hydraulic_control()
+            self._run_static_pipeflow()
+        elif self._has_controllers():
+            self._run_control_loop()
+        else:
+            self._run_static_pipeflow()
+
+    def _run_sparse_solver(self):
+        if self._has_controllers():
+            raise RuntimeError("The sparse solver backend does not run pandapipes controllers, use the pandapipes backend.")
+
+        self._sparse_solver.solve(
+            self.network.heat_exchanger['qext_w'].to_numpy(),
+            solve_hydraulics=self._hydraulics_solved,
+            warm_start=self.warm_start
+        )
+
+        for stage, iterations in self._sparse_solver.iterations.items():
+            self.solver_iterations[stage] = self.solver_iterations.get(stage, 0) + iterations
+
+    def _needs_hydraulic_solve(self):
+        '''
+        Hydraulics are re-solved in every hydraulics_interval-th step and whenever one of the HYDRAULIC_INPUT_COLUMNS
+        changed since the last hydraulic solve. The steps in between only solve the heat transfer on the frozen
+        massflows and skip the pandapipes control loop, so controllers only act in hydraulic steps.
+
+        The sparse backend builds its arrays from the network definition once and does not see changes of the
+        pandapipes tables; with it, only the interval applies.
+        '''
+        if self._hydraulic_solution is None:
+            return True
+
+        if self._steps_since_hydraulic_solve + 1 >= self.hydraulics_interval:
+            return True
+
+        return any(
+            not np.array_equal(self.network[table][column].to_numpy(), values)
+            for (table, column), values in self._hydraulic_inputs.items()
+        )
+
+    def _store_hydraulic_solution(self):
+        '''Node pressures and branch flows of the last solve, in the layout pipeflow expects for mode="heat".'''
+        if self.solver_backend == "sparse":
+            self._hydraulic_solution = self._sparse_solver.branch_massflows.copy()
+        else:
+            self._hydraulic_solution = self._pipeflow_hydraulic_solution()
+        self._hydraulic_inputs = {
+            (table, column): self.network[table][column].to_numpy().copy()
+            for table, columns in HYDRAULIC_INPUT_COLUMNS
+            for column in columns
+            if table in self.network and column in self.network[table].columns
+        }
+        self._steps_since_hydraulic_solve = 0
+
+    def _pipeflow_hydraulic_solution(self):
+        return np.concatenate([
+            self.network["_pit"]["node"][:, PINIT],
+            self.network["_pit"]["branch"][:, BRANCH_FLOW_INIT]
+        ])
+
+    def _run_heat_transfer_pipeflow(self, hydraulic_solution=None):
+        '''Heat transfer on the stored hydraulic solution; pressures and massflows keep their last values.'''
+        if hydraulic_solution is None:
+            hydraulic_solution = self._hydraulic_solution
+
+        pp.set_user_pf_options(self.network, hyd_flag=True)
+        pp.pipeflow(self.network, sol_vec=hydraulic_solution, **{**PIPEFLOW_OPTIONS, "mode": "heat"})
+
+        if self.count_solver_iterations:
+            self._record_solver_iterations()
+
+    def _has_controllers(self):
+        return bool(self.network.controller["in_service"].any())
+
+    def _run_control_loop(self):
+        '''
+        Control loop whose pipeflows use the options of the static pipeflow, so its final results are the results
+        of the step. Falls back to a static pipeflow if the controllers do not converge.
+        '''
+        pp.set_user_pf_options(self.network, **PIPEFLOW_OPTIONS)
+
+        try:
+            pp_control.run_control(self.network, max_iter=100)
+        except:
+            warnings.warn("Controller not converged: maximum number of iterations per controller is reached", UserWarning, stacklevel=2)
+            self._run_static_pipeflow()
 
     def _run_hydraulic_control(self):
         try:
@@ -94,31 +427,37 @@ class DHNetwork:
             warnings.warn("Controller not converged: maximum number of iterations per controller is reached", UserWarning, stacklevel=2)
 
     def _run_static_pipeflow(self):
-        pp.pipeflow(
-            self.network,
-            transient=False,
-            mode="all",
-            max_iter=100,
-            run_control=True,
-            heat_transfer=True
-        )
+        if self.count_solver_iterations:
+            self._run_stage_pipeflows()
+        else:
+            pp.pipeflow(self.network, run_control=True, **PIPEFLOW_OPTIONS)
+
+    def _run_stage_pipeflows(self):
+        '''
+        The static pipeflow as a hydraulics pipeflow followed by a heat transfer pipeflow on its solution, with the
+        same results. The heat exchanger massflows are restored after the heat transfer pipeflow; the other
+        hydraulic result columns stay empty, as after a heat-only solve.
+        '''
+        pp.pipeflow(self.network, run_control=True, **{**PIPEFLOW_OPTIONS, "mode": "hydraulics"})
+        self._record_solver_iterations()
+
+        heat_exchanger_massflows = self.network.res_heat_exchanger['mdot_from_kg_per_s'].to_numpy().copy()
+        self._run_heat_transfer_pipeflow(self._pipeflow_hydraulic_solution())
+        self.network.res_heat_exchanger['mdot_from_kg_per_s'] = heat_exchanger_massflows
 
     def _update_outputs(self):
         self._update_heat_exchanger_temperature_and_massflow()
         self._update_grid_return_temperature()
 
     def _update_heat_exchanger_temperature_and_massflow(self):
-        for consumer_name, consumer in self.controlled_systems.items():
-            hex_name = self.consumer_to_hex[consumer_name]
-            from_junction = self._get_from_junction_for_heat_exchanger(hex_name)
+        junction_temperatures_k = self._junction_temperatures_k()
+        heat_exchanger_massflows = self._heat_exchanger_massflows()
 
-            consumer.supply_temperature = self._get_temperature_at_junction(from_junction)
-            consumer.massflow = self._get_massflow_into_heat_exchanger(hex_name)
+        self.consumer_supply_temperature[:] = kelvin_to_celsius(junction_temperatures_k[self._consumer_supply_junction_rows])
 
-    def _get_from_junction_for_heat_exchanger(self, hex_name):
-        return next(
-            heat_exchanger[1] for heat_exchanger in self._network_data["heat_exchangers"] if heat_exchanger[0] == hex_name
-            )
+        # A heat-only solve leaves the massflows of the last hydraulic solve in place
+        if self._hydraulics_solved:
+            self.consumer_massflow[:] = heat_exchanger_massflows[self._consumer_hex_rows]
 
     def _update_grid_return_temperature(self):
         self.grid_return_temperature = self._get_temperature_at_junction(
@@ -129,15 +468,49 @@ class DHNetwork:
         '''
         Retrieve computed temperature at specified junction in [degC]
         '''
-        junctions = self.network.junction['name'].tolist()
-        temperature_k = self.network.res_junction.at[junctions.index(junction_name), 't_k']
+        temperature_k = self._junction_temperatures_k()[self._junction_rows[junction_name]]
 
         return kelvin_to_celsius(temperature_k)
-    
-    def _get_massflow_into_heat_exchanger(self, hex_name):
-        hex_names = self.network.heat_exchanger['name'].tolist()
 
-        return self.network.res_heat_exchanger.at[hex_names.index(hex_name), 'mdot_from_kg_per_s']
+    def _junction_temperatures_k(self):
+        if self.solver_backend == "sparse":
+            return self._sparse_solver.junction_temperatures_k
+        return self.network.res_junction['t_k'].to_numpy()
+
+    def _heat_exchanger_massflows(self):
+        if self.solver_backend == "sparse":
+            return self._sparse_solver.heat_exchanger_massflows
+        return self.network.res_heat_exchanger['mdot_from_kg_per_s'].to_numpy()
+
+    def _index_network_elements(self):
+        '''
+        Map element names to their rows, which are also the index labels of the result tables (pandapipes numbers
+        the elements of a fresh network consecutively from 0).
+        '''
+        self._junction_rows = {name: row for row, name in enumerate(self.network.junction['name'])}
+        self._hex_rows      = {name: row for row, name in enumerate(self.network.heat_exchanger['name'])}
+        self._qext_column   = self.network.heat_exchanger.columns.get_loc("qext_w")
+
+    def _store_cold_start_values(self):
+        '''Initial values of a cold start, restored if a warm-started solve does not converge.'''
+        self._cold_pressures_bar  = self.network.junction['pn_bar'].to_numpy().copy()
+        self._cold_temperatures_k = self.network.junction['tfluid_k'].to_numpy().copy()
+        self._has_results = False
+
+        self._hydraulic_solution = None
+        self._hydraulics_solved = False
+
+    def _create_sparse_solver(self):
+        return SparseNetworkSolver(
+            self._network_data,
+            fluid                    =self.network.fluid,
+            grid_massflow            =self.grid_massflow,
+            pipe_diameter_m          =PIPE_DIAMETER_M,
+            pipe_roughness_mm        =PIPE_ROUGHNESS_MM,
+            pipe_u_w_per_m2k         =PIPE_U_W_PER_M2K,
+            valve_diameter_m         =VALVE_DIAMETER_M,
+            heat_exchanger_diameter_m=HEAT_EXCHANGER_DIAMETER_M
+        )
 
     def _create_network(self):
         self._initialize_empty_network()
@@ -230,7 +603,7 @@ class DHNetwork:
             geodata =geodata
         )
 
-    def _create_pipe(self, name, from_junction, to_junction, length_km, sections, diameter_m=0.1, k_mm=0.01, alpha_w_per_m2k=1.5, text_k=None):
+    def _create_pipe(self, name, from_junction, to_junction, length_km, sections, diameter_m=PIPE_DIAMETER_M, k_mm=PIPE_ROUGHNESS_MM, alpha_w_per_m2k=PIPE_U_W_PER_M2K, text_k=None):
         if not text_k:
             ambient_temperature_C = self._network_data["external_grid"]["ambient_temperature"]
             text_k = celsius_to_kelvin(ambient_temperature_C)
@@ -248,7 +621,7 @@ class DHNetwork:
             name            = name
         )
 
-    def _create_valve(self, name, from_junction, to_junction, diameter_m=0.1, loss_coefficient=0, opened=True):
+    def _create_valve(self, name, from_junction, to_junction, diameter_m=VALVE_DIAMETER_M, loss_coefficient=0, opened=True):
         pp.create_valve(
             self.network, 
             from_junction   =self._get_junction_index(from_junction),
@@ -259,7 +632,7 @@ class DHNetwork:
             name            =name
         )
     
-    def _create_heat_exchanger(self, name, from_junction, to_junction, qext, diameter_m=0.1):
+    def _create_heat_exchanger(self, name, from_junction, to_junction, qext, diameter_m=HEAT_EXCHANGER_DIAMETER_M):
 
         pp.create_heat_exchanger(
             self.network, 
@@ -1,9 +1,20 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import sys
+sys.path.append('.')
+
+from models.Auxiliary.fleet import Fleet, empty_column
+from models.Auxiliary.numba_support import njit
+from models.Auxiliary.performance_map import load_performance_map
 
 HEAT_CAPACITY_WATER = 4.18e3  # Specific heat capacity of water (J/kg°C)
 
 @dataclass
 class HeatPump:
+    STATELESS = True # outputs only depend on inputs and parameters (see BasicSimulator.skip_unchanged)
+
     # Parameters
     cop_nominal          : float # [ ] Nominal Coefficient of Performance
     heat_capacity_nominal: float # [W] Nominal heating capacity in watts
@@ -20,13 +31,20 @@ class HeatPump:
     heat_consumption       : float = 0.0 # [W] Heat taken from the thermal network
     electricity_consumption: float = 0.0 # [W] Electricity consumed by the heat pump
 
+    # Config
+    performance_map: str = None # path to a manufacturer performance map (see PerformanceMap.from_csv). If set,
+                                # COP and capacity come from the map instead of cop_nominal/heat_capacity_nominal
+
+    def __post_init__(self):
+        self._performance_map = load_performance_map(self.performance_map) if self.performance_map else None
+
     def step(self):
         modulation_factor = self._compute_modulation_factor_based_on_tank_temperature()
 
         self._operate(modulation_factor)
 
     def _operate(self, modulation_factor: float):
-        cop = self._compute_cop()
+        cop = self._compute_cop(modulation_factor)
         
         self.heat_output = self._compute_heat_output(modulation_factor)
 
@@ -37,9 +55,13 @@ class HeatPump:
     def _compute_target_temperature(self):
         return self.temp_max + 10
 
-    def _compute_cop(self):
+    def _compute_cop(self, modulation_factor: float):
         target_output_temperature = self._compute_target_temperature()
 
+        if self._performance_map is not None:
+            return float(self._performance_map.evaluate(
+                "cop", self.supply_temperature, target_output_temperature, modulation_factor))
+
         temperature_lift = target_output_temperature - self.supply_temperature
 
         return max(self.cop_nominal - 0.05 * temperature_lift, 1.0) 
@@ -57,6 +79,135 @@ class HeatPump:
         reference_temperature = self.temp_max
         return self.massflow * HEAT_CAPACITY_WATER * (reference_temperature - self.supply_temperature)
     
+    def _compute_heat_capacity(self):
+        if self._performance_map is None:
+            return self.heat_capacity_nominal
+
+        return float(self._performance_map.evaluate(
+            "heat_capacity", self.supply_temperature, self._compute_target_temperature()))
+
     def _compute_heat_output(self, modulation_factor: float):
         max_heat_transfer = self._maximum_heat_transfer_from_heat_network()
-        return min(self.heat_capacity_nominal * modulation_factor, max_heat_transfer)
+        return min(self._compute_heat_capacity() * modulation_factor, max_heat_transfer)
+
+
+@dataclass
+class HeatPumpFleet(Fleet):
+    '''
+    Struct-of-arrays version of HeatPump with one array entry per heat pump. All heat pumps are stepped
+    together, either vectorized with NumPy (step) or in a compiled loop (step_compiled).
+    '''
+    model_class = HeatPump
+
+    # Parameters
+    cop_nominal          : np.ndarray = field(default_factory=empty_column) # [ ]
+    heat_capacity_nominal: np.ndarray = field(default_factory=empty_column) # [W]
+    temp_min             : np.ndarray = field(default_factory=empty_column) # [°C]
+    temp_max             : np.ndarray = field(default_factory=empty_column) # [°C]
+
+    # Inputs
+    supply_temperature: np.ndarray = field(default_factory=empty_column) # [°C]
+    massflow          : np.ndarray = field(default_factory=empty_column) # [kg/s]
+    tank_temperature  : np.ndarray = field(default_factory=empty_column) # [°C]
+
+    # Outputs
+    heat_output            : np.ndarray = field(default_factory=empty_column) # [W]
+    heat_consumption       : np.ndarray = field(default_factory=empty_column) # [W]
+    electricity_consumption: np.ndarray = field(default_factory=empty_column) # [W]
+
+    def __post_init__(self):
+        self._performance_map_rows = {} # PerformanceMap -> rows of the heat pumps using it
+
+    def add(self, num: int, **params) -> int:
+        first_index = super().add(num, **params)
+
+        if params.get("performance_map"):
+            performance_map = load_performance_map(params["performance_map"])
+            rows = self._performance_map_rows.get(performance_map, np.empty(0, dtype=np.intp))
+            self._performance_map_rows[performance_map] = np.concatenate((rows, np.arange(first_index, first_index + num)))
+
+        return first_index
+
+    def step(self):
+        modulation_factor = self._compute_modulation_factor_based_on_tank_temperature()
+
+        self._operate(modulation_factor)
+
+    def _operate(self, modulation_factor: np.ndarray):
+        cop = self._compute_cop(modulation_factor)
+
+        self.heat_output = self._compute_heat_output(modulation_factor)
+
+        self.electricity_consumption = self.heat_output / cop
+
+        self.heat_consumption = self.heat_output - self.electricity_consumption
+
+    def _compute_cop(self, modulation_factor: np.ndarray):
+        target_output_temperature = self.temp_max + 10
+
+        temperature_lift = target_output_temperature - self.supply_temperature
+
+        cop = np.maximum(self.cop_nominal - 0.05 * temperature_lift, 1.0)
+
+        for performance_map, rows in self._performance_map_rows.items():
+            cop[rows] = performance_map.evaluate(
+                "cop", self.supply_temperature[rows], target_output_temperature[rows], modulation_factor[rows])
+
+        return cop
+
+    def _compute_heat_capacity(self):
+        if not self._performance_map_rows:
+            return self.heat_capacity_nominal
+
+        heat_capacity = self.heat_capacity_nominal.copy()
+        for performance_map, rows in self._performance_map_rows.items():
+            heat_capacity[rows] = performance_map.evaluate(
+                "heat_capacity", self.supply_temperature[rows], self.temp_max[rows] + 10)
+
+        return heat_capacity
+
+    def _compute_modulation_factor_based_on_tank_temperature(self):
+        # Full power below temp_min, off above temp_max, linear in between (requires temp_max > temp_min)
+        return np.clip((self.temp_max - self.tank_temperature) / (self.temp_max - self.temp_min), 0.0, 1.0)
+
+    def _compute_heat_output(self, modulation_factor: np.ndarray):
+        max_heat_transfer = self.massflow * HEAT_CAPACITY_WATER * (self.temp_max - self.supply_temperature)
+        return np.minimum(self._compute_heat_capacity() * modulation_factor, max_heat_transfer)
+
+    def step_compiled(self):
+        if self._performance_map_rows:
+            raise ValueError("Performance maps are only supported by the NumPy engine.")
+
+        step_heat_pumps_kernel(
+            self.cop_nominal,
+            self.heat_capacity_nominal,
+            self.temp_min,
+            self.temp_max,
+            self.supply_temperature,
+            self.massflow,
+            self.tank_temperature,
+            self.heat_output,
+            self.heat_consumption,
+            self.electricity_consumption
+        )
+
+@njit(cache=True)
+def step_heat_pumps_kernel(cop_nominal, heat_capacity_nominal, temp_min, temp_max, supply_temperature, massflow,
+                           tank_temperature, heat_output, heat_consumption, electricity_consumption):
+    '''HeatPump.step for every heat pump, writing the output arrays in place.'''
+    for i in range(len(heat_output)):
+        if tank_temperature[i] < temp_min[i]:
+            modulation_factor = 1.0
+        elif tank_temperature[i] > temp_max[i]:
+            modulation_factor = 0.0
+        else:
+            modulation_factor = (temp_max[i] - tank_temperature[i]) / (temp_max[i] - temp_min[i])
+
+        temperature_lift = (temp_max[i] + 10) - supply_temperature[i]
+        cop = max(cop_nominal[i] - 0.05 * temperature_lift, 1.0)
+
+        max_heat_transfer = massflow[i] * HEAT_CAPACITY_WATER * (temp_max[i] - supply_temperature[i])
+        heat_output[i] = min(heat_capacity_nominal[i] * modulation_factor, max_heat_transfer)
+
+        electricity_consumption[i] = heat_output[i] / cop
+        heat_consumption[i] = heat_output[i] - electricity_consumption[i]
@@ -1,10 +1,13 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import datetime as dt
 
+import numpy as np
+
 import sys
 sys.path.append('.')
 
 from models.Auxiliary.csv_timeseries_reader import CsvTimeseriesReader
+from models.Auxiliary.fleet import Fleet, empty_column
 
 @dataclass
 class PvSystem:
@@ -14,19 +17,72 @@ class PvSystem:
 
     power_output : float       = 0.0 # [W] current power output
 
+    # Optional pre-resampling onto the step grid (see CsvTimeseriesReader.resample_to_step_grid)
+    resampling   : str         = None # "hold", "linear" or "mean"
+    step_size    : int         = None # [s]
+    duration     : int         = None # [s]
+
     def __post_init__(self):
         self._current_time = self.start_time
 
         self._data_reader = CsvTimeseriesReader(csv_path=self.csv_path)
 
+        self._step_grid = None
+        if self.resampling is not None:
+            self._step_grid = self._data_reader.resample_to_step_grid(
+                self.start_time, self.step_size, self.duration, self.resampling)
+
     def step(self, seconds_since_start: int):
+        if self._step_grid is not None:
+            normalized_power = self._step_grid.get_value(seconds_since_start)
+            if normalized_power is not None:
+                self._update_power_output(normalized_power)
+                return
+
         self._update_current_time(seconds_since_start)
-        self._update_power_output()
+        self._update_power_output(self._data_reader.get_value_at_or_before(self._current_time))
 
-    def _update_power_output(self):
-        normalized_power = self._data_reader.get_value_at_or_before(self._current_time)
+    def _update_power_output(self, normalized_power: float):
         scaled_power = normalized_power * -self.peak_power
         self.power_output = scaled_power
 
     def _update_current_time(self, seconds_since_start: int):
-        self._current_time = self.start_time + dt.timedelta(seconds=seconds_since_start)
\ No newline at end of file
+        self._current_time = self.start_time + dt.timedelta(seconds=seconds_since_start)
+
+
+@dataclass
+class PvSystemFleet(Fleet):
+    '''
+    Struct-of-arrays version of PvSystem with one array entry per PV system. PV systems with the same profile
+    (csv_path, start_time and resampling settings) share one PvSystem of 1 W peak power as their source,
+    so the profile is looked up once per step and group and scaled with the peak_power column.
+    '''
+    model_class = PvSystem
+
+    # Parameters
+    peak_power  : np.ndarray = field(default_factory=empty_column) # [W]
+
+    # Outputs
+    power_output: np.ndarray = field(default_factory=empty_column) # [W]
+
+    def __post_init__(self):
+        self._sources = {} # profile parameters -> (unit PvSystem, rows using it)
+
+    def add(self, num: int, peak_power: float, **profile_params) -> int:
+        profile_key = tuple(sorted(profile_params.items()))
+        if profile_key not in self._sources:
+            self._sources[profile_key] = (PvSystem(peak_power=1.0, **profile_params), np.empty(0, dtype=np.intp))
+
+        source, rows = self._sources[profile_key]
+        first_index = self._append_rows(num, source)
+        self.peak_power[first_index:] = peak_power
+
+        new_rows = np.arange(first_index, first_index + num)
+        self._sources[profile_key] = (source, np.concatenate((rows, new_rows)))
+
+        return first_index
+
+    def step(self, seconds_since_start: int):
+        for source, rows in self._sources.values():
+            source.step(seconds_since_start)
+            self.power_output[rows] = source.power_output * self.peak_power[rows]
@@ -5,6 +5,7 @@ import sys
 sys.path.append('.')
 
 from models.Auxiliary.csv_timeseries_reader import CsvTimeseriesReader
+from models.Auxiliary.streaming_csv_timeseries_reader import StreamingCsvTimeseriesReader
 
 @dataclass
 class Temperature:
@@ -13,12 +14,38 @@ class Temperature:
 
     temperature : float = 20.0 # [°C]
 
+    # Optional pre-resampling onto the step grid (see CsvTimeseriesReader.resample_to_step_grid)
+    resampling   : str = None  # "hold", "linear" or "mean"
+    step_size    : int = None  # [s]
+    duration     : int = None  # [s]
+
+    # Read the CSV file in chunks instead of loading it completely (for multi-year datasets)
+    streaming    : bool = False
+
     def __post_init__(self):
         self._current_time = self.start_time
 
-        self._data_reader = CsvTimeseriesReader(csv_path=self.csv_path)
+        if self.streaming and self.resampling is not None:
+            raise ValueError("Resampling needs the complete timeseries and cannot be combined with streaming.")
+
+        self._data_reader = self._create_data_reader()
+
+        self._step_grid = None
+        if self.resampling is not None:
+            self._step_grid = self._data_reader.resample_to_step_grid(
+                self.start_time, self.step_size, self.duration, self.resampling)
+
+    def _create_data_reader(self, **reader_options):
+        reader_class = StreamingCsvTimeseriesReader if self.streaming else CsvTimeseriesReader
+        return reader_class(csv_path=self.csv_path, **reader_options)
 
     def step(self, seconds_since_start: int):
+        if self._step_grid is not None:
+            temperature = self._step_grid.get_value(seconds_since_start)
+            if temperature is not None:
+                self.temperature = temperature
+                return
+
         self._update_current_time(seconds_since_start)
         self._update_temperature()
 
@@ -26,4 +53,41 @@ class Temperature:
         self.temperature = self._data_reader.get_value_at_or_before(self._current_time)
 
     def _update_current_time(self, seconds_since_start: int):
-        self._current_time = self.start_time + dt.timedelta(seconds=seconds_since_start)
\ No newline at end of file
+        self._current_time = self.start_time + dt.timedelta(seconds=seconds_since_start)
+
+
+@dataclass
+class TemperatureStations(Temperature):
+    '''
+    Temperatures of several stations or climate zones stored in one wide table (one column per station).
+    All stations share one time index, so each step needs a single lookup for all of them.
+    '''
+    columns     : list = None # station columns of the CSV file
+    temperatures: list = None # [°C] one value per station
+
+    def _create_data_reader(self):
+        return super()._create_data_reader(columns=self.columns)
+
+    def step(self, seconds_since_start: int):
+        temperatures = None
+        if self._step_grid is not None:
+            temperatures = self._step_grid.get_value(seconds_since_start)
+
+        if temperatures is None:
+            self._update_current_time(seconds_since_start)
+            temperatures = self._data_reader.get_row_at_or_before(self._current_time).tolist()
+
+        self.temperatures = temperatures
+
+
+class StationTemperature:
+    '''
+    Temperature of a single station of a shared TemperatureStations table.
+    '''
+    def __init__(self, stations: TemperatureStations, index: int):
+        self._stations = stations
+        self._index = index
+
+    @property
+    def temperature(self) -> float: # [°C]
+        return self._stations.temperatures[self._index]
@@ -13,18 +13,30 @@ SIM_CONFIG = {
     'HeatPumpSim': {
         "python": "simulators.heat_pump_sim:HeatPumpSim"
     },
+    'HeatPumpBatchSim': {
+        "python": "simulators.heat_pump_sim:HeatPumpBatchSim"
+    },
     'BuildingSim': {
         "python": "simulators.building_sim:BuildingSim"
     },
+    'BuildingBatchSim': {
+        "python": "simulators.building_sim:BuildingBatchSim"
+    },
     'DataCenterSim': {
         "python": "simulators.data_center_sim:DataCenterSim"
     },
+    'DataCenterBatchSim': {
+        "python": "simulators.data_center_sim:DataCenterBatchSim"
+    },
     'TemperatureSim': {
         "python": "simulators.temperature_sim:TemperatureSim"
     },
     'PvSystemSim': {
         "python": "simulators.pv_system_sim:PvSystemSim"
     },
+    'PvSystemBatchSim': {
+        "python": "simulators.pv_system_sim:PvSystemBatchSim"
+    },
     'MonitorSim': {
         "python": "simulators.monitor_sim:MonitorSim"
     },
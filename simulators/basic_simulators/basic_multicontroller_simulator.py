@@ -1,24 +1,53 @@
 import mosaik_api
 import asyncio
+import threading
 
-from concurrent.futures import ThreadPoolExecutor
+from simulators.basic_simulators.channel_registry import ChannelRegistry
 
+_background_loop = None
+_background_loop_lock = threading.Lock()
 
-def reverse_dictionary_lookup(dictionary, value_to_find):
-    key = next(key for key, value in dictionary.items() if value == value_to_find)
-    return key
 
+def _get_background_loop():
+    '''Event loop running in a daemon thread, created on first use and shared by all simulators of the process.'''
+    global _background_loop
 
-def run_async_in_thread(coroutine):
-    with ThreadPoolExecutor() as executor:
-        loop = asyncio.new_event_loop()
-        future = executor.submit(loop.run_until_complete, coroutine)
-        result = future.result()
-        loop.close()
-        return result
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="mosaik-async-calls", daemon=True).start()
+            _background_loop = loop
+
+    return _background_loop
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def run_async_in_thread(awaitable):
+    '''
+    Wait for a call to the mosaik proxy from a synchronous API method. Awaitables run on the shared background
+    loop, so no thread or event loop is created per call; plain results (synchronous proxies) are returned as is.
+    '''
+    if not asyncio.iscoroutine(awaitable):
+        if not hasattr(awaitable, "__await__"):
+            return awaitable
+        awaitable = _await(awaitable)
+
+    return asyncio.run_coroutine_threadsafe(awaitable, _get_background_loop()).result()
 
 
 class BasicMulticontrollerSimulator(mosaik_api.Simulator):
+    '''
+    Base for simulators whose controllers (e.g. DHNetwork) each serve several channels (e.g. heat exchangers),
+    to which systems of other simulators are connected.
+
+    Controllers keep one object per connected system in `controlled_systems`, initialized from the systems and
+    the positions of their channels (see initialize_controlled_systems). A controller can additionally expose
+    `input_arrays` (channel attribute -> array with one entry per channel position); _route_inputs() then
+    writes those inputs straight into the arrays.
+    '''
     def __init__(self, meta, controller_class):
         super().__init__(meta)
 
@@ -31,9 +60,13 @@ class BasicMulticontrollerSimulator(mosaik_api.Simulator):
         self._set_eid_fixes()
 
         self.controllers = {}
-        self.controller_channels = {}
-        self.channel_controllers = {}
-        self.systems_channels_dict = {}
+        self.channels = ChannelRegistry()
+
+        self._controller_attributes = frozenset(self.meta['models'][self.controller_model]['attrs'])
+        self._channel_attributes = frozenset(self.meta['models'][self.channel_model]['attrs'])
+
+        self._input_routes = {}              # controller ID -> {channel attribute: (input array, {system ID: index})}
+        self._controllers_with_inputs = {}   # reused by _route_inputs, in order of appearance
 
     def init(self, sid, step_size=1, time_resolution=1.0, **kwargs):
         if float(time_resolution) != 1.0:
@@ -63,6 +96,7 @@ class BasicMulticontrollerSimulator(mosaik_api.Simulator):
     def setup_done(self):
         self._create_system_to_channel_map()
         self._models_initialize_controlled_systems()
+        self._create_input_routes()
 
     def step(self, time, inputs, max_advance):
         raise NotImplementedError(
@@ -127,10 +161,10 @@ class BasicMulticontrollerSimulator(mosaik_api.Simulator):
 
     # -------------------------------------------------------------------------------------------------------------#
     def _is_controller(self, entity_id):
-        return entity_id in self.controllers.keys()
+        return entity_id in self.controllers
 
     def _is_channel(self, entity_id):
-        return entity_id in self.channel_controllers.keys()
+        return self.channels.is_channel(entity_id)
 
     def _get_data_from_controller(self, attributes, data, controller_id):
         controller = self.controllers[controller_id]
@@ -147,25 +181,24 @@ class BasicMulticontrollerSimulator(mosaik_api.Simulator):
                 raise ValueError(f"Unknown output attribute: {attribute}")
 
     def _is_valid_controller_attribute(self, attribute_name):
-        return attribute_name in self.meta['models'][self.controller_model]['attrs']
+        return attribute_name in self._controller_attributes
 
     def _get_data_from_channel(self, attributes, data, channel_id):
-        controller_id = self.channel_controllers[channel_id]
-        controller = self.controllers[controller_id]
+        controller = self.controllers[self.channels.channel_controllers[channel_id]]
+        system = controller.controlled_systems[self.channels.channel_systems[channel_id]]
 
         data[channel_id] = {}
 
         for attribute in attributes:
             if self._is_valid_channel_attribute(attribute):
-                system_id = reverse_dictionary_lookup(self.systems_channels_dict, channel_id)
-                attribute_value = getattr(controller.controlled_systems[system_id], attribute)
+                attribute_value = getattr(system, attribute)
                 if attribute_value is not None:
                     data[channel_id][attribute] = attribute_value
             else:
                 raise ValueError(f"Unknown output attribute: {attribute}")
 
     def _is_valid_channel_attribute(self, attribute_name):
-        return attribute_name in self.meta['models'][self.channel_model]['attrs']
+        return attribute_name in self._channel_attributes
 
     def _make_controller_entity(self, channel_ids, controller_id):
         channels = []
@@ -187,14 +220,9 @@ class BasicMulticontrollerSimulator(mosaik_api.Simulator):
 
     def _create_channels_for_controller(self, num_channels, controller_id):
         channel_ids = self._make_channel_eids(controller_id, num_channels)
-        self._register_channels_for_controller(channel_ids, controller_id)
+        self.channels.register_controller(controller_id, channel_ids)
         return channel_ids
 
-    def _register_channels_for_controller(self, channel_ids, controller_id):
-        self.controller_channels[controller_id] = channel_ids
-        for channel_id in channel_ids:
-            self.channel_controllers[channel_id] = controller_id
-
     def _make_controller_eid(self, controller_index):
         return f"{self.controller_eid_prefix}{controller_index}"
 
@@ -203,59 +231,68 @@ class BasicMulticontrollerSimulator(mosaik_api.Simulator):
 
     # -------------------------------------------------------------------------------------------------------------#
 
-    def _sort_inputs_by_controller(self, inputs: dict):
-        inputs_processed = {}
+    def _route_inputs(self, inputs: dict):
+        '''
+        Write the inputs into the controllers (input arrays where available, else the controlled system objects)
+        and return the IDs of the controllers that received inputs. As before, a channel attribute with several
+        sources takes the value of the first one.
+        '''
+        controllers_with_inputs = self._controllers_with_inputs
+        controllers_with_inputs.clear()
 
-        for entity_id, values in inputs.items():
-            if self._is_controller(entity_id):
-                self._add_controller_attribute_to_processed_inputs(inputs_processed, entity_id, values)
-            elif self._is_channel(entity_id):
-                self._add_channel_attribute_to_processed_inputs(inputs_processed, entity_id, values)
-        return inputs_processed
+        controllers = self.controllers
+        channel_controllers = self.channels.channel_controllers
+        input_routes = self._input_routes
 
-    def _add_controller_attribute_to_processed_inputs(self, inputs_processed, controller_id, values):
-        self._ensure_field_exists(inputs_processed, controller_id)
-
-        for attribute in values.keys():
-            value = self._first_dict_value(values[attribute])
-            inputs_processed[controller_id][attribute] = value
-
-    def _add_channel_attribute_to_processed_inputs(self, inputs_processed, channel_id, values):
-        channel_id = self.channel_controllers[channel_id]
-
-        self._ensure_field_exists(inputs_processed, channel_id)
-
-        for attribute in values.keys():
-            source = self._first_dict_key(values[attribute])
-            value = self._first_dict_value(values[attribute])
-            self._ensure_field_exists(inputs_processed[channel_id], attribute)
-            inputs_processed[channel_id][attribute][source] = value
-
-    @staticmethod
-    def _ensure_field_exists(dictionary: dict, key):
-        if key not in dictionary:
-            dictionary[key] = {}
-
-    @staticmethod
-    def _first_dict_value(dictionary: dict):
-        return list(dictionary.values())[0]
-
-    @staticmethod
-    def _first_dict_key(dictionary: dict):
-        return list(dictionary.keys())[0]
+        for entity_id, values in inputs.items():
+            controller_id = channel_controllers.get(entity_id)
+
+            if controller_id is None:
+                if entity_id in controllers:
+                    controllers_with_inputs[entity_id] = None
+                    for attribute, sources in values.items():
+                        setattr(controllers[entity_id], attribute, next(iter(sources.values())))
+                continue
+
+            controllers_with_inputs[controller_id] = None
+
+            for attribute, sources in values.items():
+                input_array, system_indices = input_routes[controller_id][attribute]
+                for source, value in sources.items():
+                    index = system_indices.get(source)
+                    if index is not None:
+                        input_array[index] = value
+                    else:
+                        setattr(controllers[controller_id].controlled_systems[source], attribute, value)
+                    break
+
+        return controllers_with_inputs
+
+    def _create_input_routes(self):
+        self._input_routes = {}
+
+        for controller_id, controller in self.controllers.items():
+            input_arrays = getattr(controller, "input_arrays", {})
+            systems = self.channels.connected_systems(controller_id)
+            positions = self.channels.connected_positions(controller_id)
+
+            routes = self._input_routes[controller_id] = {attribute: (None, {}) for attribute in self._channel_attributes}
+            for attribute, input_array in input_arrays.items():
+                routes[attribute] = (input_array, {
+                    system_id: int(position) for system_id, position in zip(systems, positions) if position < len(input_array)
+                })
 
     def _create_system_to_channel_map(self):
-        channels_formatted = [self.simulator_id + "." + channel for channels in self.controller_channels.values() for
-                              channel in channels]
+        channels_formatted = [self.simulator_id + "." + channel for channels in self.channels.controller_channels.values()
+                              for channel in channels]
         channels_systems_dict = run_async_in_thread(self.mosaik.get_related_entities(channels_formatted))
-        systems_channels_dict = {}
+
         for outer_key, inner_dict in channels_systems_dict.items():
             for inner_key in inner_dict.keys():
-                relevant_part_of_outer_key = outer_key.split('.')[1]
-                systems_channels_dict[inner_key] = relevant_part_of_outer_key
-
-        self.systems_channels_dict = systems_channels_dict
+                relevant_part_of_outer_key = outer_key.split('.', 1)[1]
+                self.channels.connect(inner_key, relevant_part_of_outer_key)
 
     def _models_initialize_controlled_systems(self):
-        for controller in self.controllers.values():
-            controller.initialize_controlled_systems(self.systems_channels_dict.keys())
+        for controller_id, controller in self.controllers.items():
+            controller.initialize_controlled_systems(
+                self.channels.connected_systems(controller_id), self.channels.connected_positions(controller_id))
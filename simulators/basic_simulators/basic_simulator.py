@@ -2,6 +2,15 @@ import mosaik_api
 
 
 class BasicSimulator(mosaik_api.Simulator):
+    '''
+    Base for single-model simulators with one model object per entity.
+
+    With skip_unchanged=True (init parameter), an entity whose inputs did not change since its last step is
+    not stepped again, and its previous outputs are reported, if its model declares that this is exact:
+    either `STATELESS = True` (outputs are a pure function of inputs and parameters, independent of time) or an
+    `is_steady_state()` method that returns True while a step with unchanged inputs would not change the model.
+    Simulators iterate entities_to_step() for this; step_calls and skipped_steps count the outcome.
+    '''
     def __init__(self, meta, model_class):
         super().__init__(meta)
 
@@ -20,12 +29,24 @@ class BasicSimulator(mosaik_api.Simulator):
         self.sid = None
         self.step_size = None
 
-    def init(self, sid, step_size=1, time_resolution=1.0, eid_prefix=None):
+        self._output_attributes = frozenset(self.meta['models'][self.model]['attrs'])
+        self._output_request = None  # last `outputs` of get_data and its plan
+        self._output_plan = None
+
+        self.skip_unchanged = False
+        self.step_calls    = 0 # entity steps that were computed
+        self.skipped_steps = 0 # entity steps skipped by skip_unchanged
+        self._changed_entities = set() # eids with new inputs (or not yet stepped) since the last step
+        self._model_is_stateless = getattr(model_class, "STATELESS", False)
+        self._model_has_steady_state = hasattr(model_class, "is_steady_state")
+
+    def init(self, sid, step_size=1, time_resolution=1.0, eid_prefix=None, skip_unchanged=False):
         if float(time_resolution) != 1.0:
             raise ValueError(f"{self.model} only supports time_resolution=1.0, but {time_resolution} was set.")
 
         self.sid = sid
         self.step_size = step_size
+        self.skip_unchanged = skip_unchanged
 
         if eid_prefix is not None:
             self.eid_prefix = eid_prefix
@@ -43,6 +64,7 @@ class BasicSimulator(mosaik_api.Simulator):
             entity = self.model_class(**kwargs)
             eid = f"{self.eid_prefix}{idx}"
             self.entities[eid] = entity
+            self._changed_entities.add(eid)
             created_entities.append({'eid': eid, 'type': model})
 
         return created_entities
@@ -50,36 +72,96 @@ class BasicSimulator(mosaik_api.Simulator):
     def step(self, time, inputs, max_advance):
         self.time = time
 
-        for eid, entity in self.entities.items():
-            self.set_params_if_in_inputs(entity, eid, inputs)
+        self.apply_inputs(inputs)
+        for entity in self.entities_to_step():
             entity.step(time)
 
         return self.next_simulation_time(max_advance)
 
+    def apply_inputs(self, inputs):
+        '''Set all inputs on their entities in one pass over `inputs` (only entities with inputs are visited).'''
+        entities = self.entities
+
+        if self.skip_unchanged:
+            for eid, input_data in inputs.items():
+                entity = entities[eid]
+                for attr, value in input_data.items():
+                    value = next(iter(value.values()))
+                    if value != getattr(entity, attr):
+                        setattr(entity, attr, value)
+                        self._changed_entities.add(eid)
+            return
+
+        for eid, input_data in inputs.items():
+            entity = entities[eid]
+            for attr, value in input_data.items():
+                setattr(entity, attr, next(iter(value.values())))
+
+    def entities_to_step(self):
+        '''Entities to step in the current step: all of them, unless skip_unchanged allows leaving some out.'''
+        if not self.skip_unchanged or not (self._model_is_stateless or self._model_has_steady_state):
+            self.step_calls += len(self.entities)
+            return self.entities.values()
+
+        changed_entities, self._changed_entities = self._changed_entities, set()
+        entities_to_step = [
+            entity for eid, entity in self.entities.items()
+            if eid in changed_entities or not (self._model_is_stateless or entity.is_steady_state())
+        ]
+
+        self.step_calls    += len(entities_to_step)
+        self.skipped_steps += len(self.entities) - len(entities_to_step)
+
+        return entities_to_step
+
+    @property
+    def skip_ratio(self) -> float:
+        '''Share of entity steps skipped so far.'''
+        total_steps = self.step_calls + self.skipped_steps
+        return self.skipped_steps / total_steps if total_steps else 0.0
+
     @staticmethod
     def set_params_if_in_inputs(entity, eid, inputs):
-        if eid in inputs:
-            input_data = inputs[eid]
+        input_data = inputs.get(eid)
+        if input_data:
             for attr, value in input_data.items():
-                setattr(entity, attr, list(value.values())[0])
+                setattr(entity, attr, next(iter(value.values())))
 
     def get_data(self, outputs):
+        '''
+        mosaik usually requests the same entities and attributes every step, so the request is validated and
+        compiled into a plan (entity objects and attribute tuples) once and reused while it does not change.
+        '''
+        if outputs != self._output_request:
+            self._output_plan = self._compile_output_plan(outputs)
+            self._output_request = {eid: list(attributes) for eid, attributes in outputs.items()}
+
         data = {'time': self.time}
 
-        for eid, attributes in outputs.items():
-            entity = self.entities[eid]
-            data[eid] = {}
+        for eid, entity, attributes in self._output_plan:
+            entity_data = data[eid] = {}
 
             for attribute in attributes:
-                if attribute not in self.meta["models"][self.model]["attrs"]:
-                    raise ValueError(f"Unknown output attribute {attribute}")
-
                 attribute_value = getattr(entity, attribute)
                 if attribute_value is not None:
-                    data[eid][attribute] = attribute_value
+                    entity_data[attribute] = attribute_value
 
         return data
 
+    def _compile_output_plan(self, outputs):
+        plan = []
+
+        for eid, attributes in outputs.items():
+            attributes = tuple(attributes)
+
+            for attribute in attributes:
+                if attribute not in self._output_attributes:
+                    raise ValueError(f"Unknown output attribute {attribute}")
+
+            plan.append((eid, self.entities[eid], attributes))
+
+        return plan
+
     def next_simulation_time(self, max_advance):
         advance = min(self.step_size, max_advance) if max_advance else self.step_size
 
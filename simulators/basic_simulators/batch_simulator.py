@@ -0,0 +1,95 @@
+import warnings
+
+from simulators.basic_simulators.basic_simulator import BasicSimulator
+from models.Auxiliary.numba_support import NUMBA_AVAILABLE
+
+
+class BatchSimulator(BasicSimulator):
+    '''
+    Sibling of BasicSimulator for many entities of one model. Instead of one model object per entity, all
+    entities are rows of one Fleet (typed columns, struct-of-arrays), so an entity costs only its column
+    entries (see Fleet.nbytes). self.entities maps entity IDs to fleet rows.
+
+    Inputs are scattered into the columns in one pass per step, outputs are gathered from them in get_data.
+    Subclasses list their step implementations in ENGINES (the first one is the default) and implement the
+    vectorized step_all(arrays, time_step) hook.
+    '''
+    ENGINES = ("numpy",)
+
+    def __init__(self, meta, model_class, fleet_class):
+        super().__init__(meta, model_class)
+
+        self.fleet = fleet_class()
+        self.engine = self.ENGINES[0]
+
+    def init(self, sid, step_size=1, time_resolution=1.0, eid_prefix=None, engine=None):
+        meta = super().init(sid, step_size=step_size, time_resolution=time_resolution, eid_prefix=eid_prefix)
+
+        if engine is not None:
+            if engine not in self.ENGINES:
+                raise ValueError(f"{self.__class__.__name__} supports the engines {self.ENGINES}, but {engine} was set.")
+            self.engine = engine
+
+        if self.engine == "numba" and not NUMBA_AVAILABLE:
+            warnings.warn("numba is not installed, the numba engine runs as plain Python.", UserWarning, stacklevel=2)
+
+        return meta
+
+    def create(self, num, model, **kwargs):
+        if model != self.model:
+            raise ValueError(f"The simulator can only instantiate entities of type {model}")
+
+        first_row = self.fleet.add(num, **kwargs)
+        created_entities = []
+
+        for row in range(first_row, first_row + num):
+            eid = f"{self.eid_prefix}{row}"
+            self.entities[eid] = row
+            created_entities.append({'eid': eid, 'type': model})
+
+        return created_entities
+
+    def step(self, time, inputs, max_advance):
+        self.time = time
+
+        self._scatter_inputs(inputs)
+        self.step_all(self.fleet, self.step_size)
+
+        return time + self.step_size
+
+    def step_all(self, arrays, time_step):
+        '''Advance all rows of `arrays` (the fleet) by `time_step` seconds. self.time holds the current time.'''
+        raise NotImplementedError(
+            f"The step_all() function must be implemented by the subclass of {self.__class__.__name__}"
+        )
+
+    def _scatter_inputs(self, inputs):
+        rows_and_values = {}
+
+        for eid, input_data in inputs.items():
+            row = self.entities[eid]
+            for attr, value in input_data.items():
+                rows, values = rows_and_values.setdefault(attr, ([], []))
+                rows.append(row)
+                values.append(next(iter(value.values())))
+
+        for attr, (rows, values) in rows_and_values.items():
+            getattr(self.fleet, attr)[rows] = values
+
+    def get_data(self, outputs):
+        data = {'time': self.time}
+        columns = {} # fleet arrays converted to lists once per call
+
+        for eid, attributes in outputs.items():
+            row = self.entities[eid]
+            data[eid] = {}
+
+            for attribute in attributes:
+                if attribute not in columns:
+                    if attribute not in self._output_attributes:
+                        raise ValueError(f"Unknown output attribute {attribute}")
+                    columns[attribute] = getattr(self.fleet, attribute).tolist()
+
+                data[eid][attribute] = columns[attribute][row]
+
+        return data
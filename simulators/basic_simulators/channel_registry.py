@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class ChannelRegistry:
+    '''
+    Bookkeeping of a multi-controller simulator: which channels belong to which controller and which system
+    (entity of another simulator, by full mosaik ID) is connected to which channel, indexed in both directions
+    so that every lookup during data exchange is O(1).
+
+    A channel can be related to several systems (e.g. a port that feeds a heat pump and receives the heat of a
+    data center). channel_systems then holds the first of them.
+
+    Channels are numbered per controller in creation order (their position). After all connections are known,
+    connected_systems() and connected_positions() give, per controller, its systems in connection order and the
+    positions of their channels as a contiguous index array.
+    '''
+    def __init__(self):
+        self.controller_channels = {} # controller ID -> [channel IDs]
+        self.channel_controllers = {} # channel ID -> controller ID
+        self.channel_positions   = {} # channel ID -> position within its controller
+        self.system_channels     = {} # system ID -> channel ID, in connection order
+        self.channel_systems     = {} # channel ID -> first system ID connected to it
+
+        self._connected_positions = {} # controller ID -> int array
+        self._connected_systems   = {} # controller ID -> [system IDs]
+
+    def register_controller(self, controller_id, channel_ids):
+        self.controller_channels[controller_id] = list(channel_ids)
+
+        for position, channel_id in enumerate(channel_ids):
+            self.channel_controllers[channel_id] = controller_id
+            self.channel_positions[channel_id] = position
+
+    def connect(self, system_id, channel_id):
+        if channel_id not in self.channel_controllers:
+            raise ValueError(f"Unknown channel {channel_id}")
+
+        self.system_channels[system_id] = channel_id
+        self.channel_systems.setdefault(channel_id, system_id)
+
+        self._connected_positions.clear()
+
+    def is_channel(self, entity_id):
+        return entity_id in self.channel_controllers
+
+    def connected_positions(self, controller_id) -> np.ndarray:
+        '''Channel position of each system of connected_systems().'''
+        if not self._connected_positions:
+            self._index_controllers()
+        return self._connected_positions[controller_id]
+
+    def connected_systems(self, controller_id) -> list:
+        '''Systems connected to channels of the controller, in connection order.'''
+        if not self._connected_positions:
+            self._index_controllers()
+        return self._connected_systems[controller_id]
+
+    def _index_controllers(self):
+        self._connected_systems = {controller_id: [] for controller_id in self.controller_channels}
+        positions = {controller_id: [] for controller_id in self.controller_channels}
+
+        for system_id, channel_id in self.system_channels.items():
+            controller_id = self.channel_controllers[channel_id]
+            self._connected_systems[controller_id].append(system_id)
+            positions[controller_id].append(self.channel_positions[channel_id])
+
+        self._connected_positions = {
+            controller_id: np.array(controller_positions, dtype=np.intp)
+            for controller_id, controller_positions in positions.items()
+        }
@@ -1,7 +1,8 @@
 import datetime as dt
 
 from simulators.basic_simulators.basic_simulator import BasicSimulator
-from models.building import Building
+from simulators.basic_simulators.batch_simulator import BatchSimulator
+from models.building import Building, BuildingFleet
 
 META = {
     'type': 'time-based',
@@ -14,6 +15,7 @@ META = {
                 'heat_loss_coefficient',     # [W/K]
                 'tank_to_building_transfer', # [W/k]
                 'setpoint_temperature',      # [°C]
+                'integrator',                # optional: "euler" (default) or "exponential"
             ],
             'attrs': [
                 "outdoor_temperature",  # [°C]
@@ -30,10 +32,29 @@ class BuildingSim(BasicSimulator):
         super().__init__(META, Building)
 
     def step(self, time, inputs, max_advance):
-        for eid, building in self.entities.items():
-            self.set_params_if_in_inputs(building, eid, inputs)
+        self.apply_inputs(inputs)
 
+        for building in self.entities_to_step():
             time_step = dt.timedelta(seconds=self.step_size) 
             building.step(time_step)
 
         return time + self.step_size
+
+
+class BuildingBatchSim(BatchSimulator):
+    '''
+    Batch variant of BuildingSim for district studies with many buildings. All buildings are rows of one
+    BuildingFleet and are stepped together, either vectorized with NumPy or in a numba-compiled loop.
+    '''
+    ENGINES = ("numpy", "numba")
+
+    def __init__(self):
+        super().__init__(META, Building, BuildingFleet)
+
+    def step_all(self, arrays, time_step):
+        time_step_hours = time_step / 3600
+
+        if self.engine == "numba":
+            arrays.step_compiled(time_step_hours)
+        else:
+            arrays.step(time_step_hours)
@@ -1,7 +1,8 @@
 import datetime as dt
 
 from simulators.basic_simulators.basic_simulator import BasicSimulator
-from models.data_center import DataCenter
+from simulators.basic_simulators.batch_simulator import BatchSimulator
+from models.data_center import DataCenter, DataCenterFleet
 
 META = {
     'type': 'time-based',
@@ -31,10 +32,28 @@ class DataCenterSim(BasicSimulator):
         super().__init__(META, DataCenter)
 
     def step(self, time, inputs, max_advance):
-        for eid, data_center in self.entities.items():
-            # Update input parameters
-            self.set_params_if_in_inputs(data_center, eid, inputs)
+        # Update input parameters
+        self.apply_inputs(inputs)
 
+        for data_center in self.entities_to_step():
             data_center.step()
 
         return time + self.step_size
+
+
+class DataCenterBatchSim(BatchSimulator):
+    '''
+    Batch variant of DataCenterSim for many waste-heat sources (data centers, supermarkets, industrial cooling):
+    all of them are rows of one DataCenterFleet and are stepped together, either vectorized with NumPy or in a
+    numba-compiled loop.
+    '''
+    ENGINES = ("numpy", "numba")
+
+    def __init__(self):
+        super().__init__(META, DataCenter, DataCenterFleet)
+
+    def step_all(self, arrays, time_step):
+        if self.engine == "numba":
+            arrays.step_compiled()
+        else:
+            arrays.step()
@@ -9,7 +9,14 @@ META = {
             'public': True,
             'params': [
                 "network_definition_path",
-                "num_channels"
+                "num_channels",
+                "warm_start",               # Start solves from the previous results; with pandapipes only the heat stage gains
+                "solve_strategy",
+                "result_cache_size",
+                "result_cache_tolerance",
+                "hydraulics_interval",
+                "solver_backend",
+                "count_solver_iterations"
             ],
             'attrs': [
                 "grid_return_temperature"   # Return temperature of ext. grid  [degC]
@@ -37,15 +44,7 @@ class DHNetworkSim(BasicMulticontrollerSimulator):
     def step(self, time, inputs, max_advance):
         self.time = time
 
-        inputs_by_controller = self._sort_inputs_by_controller(inputs)
-
-        for controller_id, attributes in inputs_by_controller.items():
-            controller = self.controllers[controller_id]
-
-            for attribute, values in attributes.items():
-                for consumer, value in values.items():
-                    setattr(controller.controlled_systems[consumer], attribute, value)
-
-            controller.step(time)
+        for controller_id in self._route_inputs(inputs):
+            self.controllers[controller_id].step(time)
 
         return time+self.step_size
\ No newline at end of file
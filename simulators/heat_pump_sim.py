@@ -1,5 +1,6 @@
 from simulators.basic_simulators.basic_simulator import BasicSimulator
-from models.heat_pump import HeatPump
+from simulators.basic_simulators.batch_simulator import BatchSimulator
+from models.heat_pump import HeatPump, HeatPumpFleet
 
 META = {
     'type': 'time-based',
@@ -10,7 +11,8 @@ META = {
                 'cop_nominal',           # [-]
                 'heat_capacity_nominal', # [W]
                 'temp_min',              # [°C]
-                'temp_max'               # [°C]
+                'temp_max',              # [°C]
+                'performance_map'        # optional: path to a performance map CSV
             ],
             'attrs': [
                 "tank_temperature",       # [°C]
@@ -29,8 +31,26 @@ class HeatPumpSim(BasicSimulator):
         super().__init__(META, HeatPump)
 
     def step(self, time, inputs, max_advance):
-        for eid, heat_pump in self.entities.items():
-            self.set_params_if_in_inputs(heat_pump, eid, inputs)
+        self.apply_inputs(inputs)
+
+        for heat_pump in self.entities_to_step():
             heat_pump.step()
 
-        return time+self.step_size    
\ No newline at end of file
+        return time+self.step_size
+
+
+class HeatPumpBatchSim(BatchSimulator):
+    '''
+    Batch variant of HeatPumpSim for neighbourhood-scale studies: all heat pumps are rows of one HeatPumpFleet
+    and are stepped together, either vectorized with NumPy or in a numba-compiled loop.
+    '''
+    ENGINES = ("numpy", "numba")
+
+    def __init__(self):
+        super().__init__(META, HeatPump, HeatPumpFleet)
+
+    def step_all(self, arrays, time_step):
+        if self.engine == "numba":
+            arrays.step_compiled()
+        else:
+            arrays.step()
@@ -1,5 +1,6 @@
 from simulators.basic_simulators.basic_simulator import BasicSimulator
-from models.pv_system import PvSystem
+from simulators.basic_simulators.batch_simulator import BatchSimulator
+from models.pv_system import PvSystem, PvSystemFleet
 
 META = {
     'type': 'time-based',
@@ -10,6 +11,8 @@ META = {
                 'start_time',  # datetime
                 'peak_power',  # [W]
                 'csv_path',    # string
+                'resampling',  # str, optional: "hold", "linear" or "mean"
+                'duration',    # [s], required with resampling
             ],
             'attrs': [
                 'power_output' # [°C]
@@ -22,9 +25,33 @@ class PvSystemSim(BasicSimulator):
     def __init__(self):
         super().__init__(META, PvSystem)
 
+    def create(self, num, model, **kwargs):
+        if kwargs.get('resampling') is not None:
+            kwargs['step_size'] = self.step_size
+
+        return super().create(num, model, **kwargs)
+
     def step(self, time, inputs, max_advance):
         for eid, pv_system in self.entities.items():
             elapsed_seconds = time
             pv_system.step(elapsed_seconds)
 
-        return time + self.step_size
\ No newline at end of file
+        return time + self.step_size
+
+
+class PvSystemBatchSim(BatchSimulator):
+    '''
+    Batch variant of PvSystemSim: all PV systems are rows of one PvSystemFleet, and systems sharing a profile
+    read it only once per step.
+    '''
+    def __init__(self):
+        super().__init__(META, PvSystem, PvSystemFleet)
+
+    def create(self, num, model, **kwargs):
+        if kwargs.get('resampling') is not None:
+            kwargs['step_size'] = self.step_size
+
+        return super().create(num, model, **kwargs)
+
+    def step_all(self, arrays, time_step):
+        arrays.step(self.time)
@@ -1,5 +1,5 @@
 from simulators.basic_simulators.basic_simulator import BasicSimulator
-from models.temperature import Temperature
+from models.temperature import Temperature, TemperatureStations, StationTemperature
 
 META = {
     'type': 'time-based',
@@ -9,6 +9,10 @@ META = {
             'params': [
                 'start_time', # datetime
                 'csv_path',   # str
+                'resampling', # str, optional: "hold", "linear" or "mean"
+                'duration',   # [s], required with resampling
+                'streaming',  # bool, optional: read the CSV file in chunks
+                'columns',    # list[str], optional: one station column per created entity
             ],
             'attrs': [
                 'temperature' # [°C]
@@ -21,9 +25,48 @@ class TemperatureSim(BasicSimulator):
     def __init__(self):
         super().__init__(META, Temperature)
 
+        self.station_tables = []
+
+    def create(self, num, model, **kwargs):
+        if kwargs.get('resampling') is not None:
+            kwargs['step_size'] = self.step_size
+
+        if kwargs.get('columns') is not None:
+            return self._create_stations(num, model, **kwargs)
+
+        return super().create(num, model, **kwargs)
+
+    def _create_stations(self, num, model, **kwargs):
+        '''
+        Create one entity per column of a wide table. All of them are served by one shared lookup per step.
+        '''
+        if model != self.model:
+            raise ValueError(f"The simulator can only instantiate entities of type {model}")
+
+        if len(kwargs['columns']) != num:
+            raise ValueError(f"{num} entities requested, but {len(kwargs['columns'])} columns were given.")
+
+        stations = TemperatureStations(**kwargs)
+        self.station_tables.append(stations)
+
+        next_eid = len(self.entities)
+        created_entities = []
+
+        for index, idx in enumerate(range(next_eid, next_eid + num)):
+            eid = f"{self.eid_prefix}{idx}"
+            self.entities[eid] = StationTemperature(stations, index)
+            created_entities.append({'eid': eid, 'type': model})
+
+        return created_entities
+
     def step(self, time, inputs, max_advance):
+        elapsed_seconds = time
+
+        for stations in self.station_tables:
+            stations.step(elapsed_seconds)
+
         for eid, temp_model in self.entities.items():
-            elapsed_seconds = time
-            temp_model.step(elapsed_seconds)
+            if isinstance(temp_model, Temperature):
+                temp_model.step(elapsed_seconds)
 
         return time + self.step_size
\ No newline at end of file